@@ -0,0 +1,78 @@
+"""Synthetic configurations for the benchmarks
+
+Trees are built in memory by the `*_tree` functions, and written out as
+configuration directories by `write_config`.
+"""
+import json
+import os
+from typing import Any, Callable, Dict, List
+
+import yaml
+
+
+def wide_tree(width: int, layer: int) -> Dict[str, Any]:
+    """50 sections of `width` keys each"""
+    return {
+        f'section{s}': {
+            f'key{k}': f'{layer}-{k}'
+            for k in range(width)
+        }
+        for s in range(50)
+    }
+
+
+def deep_tree(depth: int, layer: int) -> Dict[str, Any]:
+    """10 chains of nested mappings, `depth` levels deep"""
+    tree: Dict[str, Any] = dict()
+    for c in range(10):
+        node = tree.setdefault(f'chain{c}', dict())
+        for d in range(depth):
+            node[f'value{d}'] = layer
+            node = node.setdefault(f'level{d}', dict())
+    return tree
+
+
+def service_tree(sections: int, layer: int) -> Dict[str, Any]:
+    """`sections` sections of mixed scalar types, like a service configuration"""
+    return {
+        f'service{s}': {
+            'name': f'service {layer} {s}',
+            'port': 8000 + s,
+            'ratio': s / 7,
+            'enabled': s % 2 == 0,
+            'hosts': [f'a{s}', f'b{s}', f'c{s}'],
+        }
+        for s in range(sections)
+    }
+
+
+def huge_list_tree(length: int, layer: int) -> Dict[str, Any]:
+    """A few keys, one of them holding a list of `length` mappings"""
+    return {
+        'name': f'layer {layer}',
+        'items': [{
+            'id': i,
+            'value': f'{layer}-{i}'
+        } for i in range(length)],
+    }
+
+
+def write_config(path: str,
+                 make: Callable[[int], Dict[str, Any]],
+                 files: int,
+                 fmt: str = 'json') -> List[str]:
+    """Writes `files` configuration files into `path`, built by `make` from the index
+    of each file, and returns their paths
+    """
+    paths: List[str] = []
+    for i in range(files):
+        name = os.path.join(path, f'config{i:04}.{fmt}')
+        with open(name, 'w') as f:
+            if fmt == 'json':
+                json.dump(make(i), f)
+            else:
+                yaml.dump(make(i),
+                          f,
+                          Dumper=getattr(yaml, 'CDumper', yaml.Dumper))
+        paths.append(name)
+    return paths
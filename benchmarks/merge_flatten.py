@@ -0,0 +1,66 @@
+"""Compares `merge_into` + `flatten` with the fused `merge_flatten`
+
+Usage:
+    python benchmarks/merge_flatten.py [--layers N] [--repeat N]
+"""
+import argparse
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from gestalt import merge_into  # noqa: E402
+from gestalt.utils import flatten, merge_flatten  # noqa: E402
+from generators import deep_tree, wide_tree  # noqa: E402
+
+
+def two_phase(layers: List[Dict[str, Any]]) -> Dict[str, Any]:
+    merged: Dict[str, Any] = dict()
+    for layer in layers:
+        merge_into(layer, merged)
+    return flatten(merged)
+
+
+def fused(layers: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return merge_flatten(layers)
+
+
+def best_of(fn: Callable[[List[Dict[str, Any]]], Dict[str, Any]],
+            layers: List[Dict[str, Any]], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(layers)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--layers', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    shapes = [
+        ('wide 50x1000', lambda layer: wide_tree(1000, layer)),
+        ('deep 10x200', lambda layer: deep_tree(200, layer)),
+        ('deep 10x900', lambda layer: deep_tree(900, layer)),
+    ]
+    for name, make in shapes:
+        layers = [make(layer) for layer in range(args.layers)]
+        fused_time = best_of(fused, layers, args.repeat)
+        try:
+            two_phase_time = best_of(two_phase, layers, args.repeat)
+            speedup = f'{two_phase_time / fused_time:.1f}x'
+            two_phase_result = f'{two_phase_time * 1000:8.1f}ms'
+        except RecursionError:
+            speedup = '-'
+            two_phase_result = 'RecursionError'
+        print(f'{name:14} two phase: {two_phase_result:>14}  '
+              f'fused: {fused_time * 1000:8.1f}ms  {speedup}')
+
+
+if __name__ == '__main__':
+    main()
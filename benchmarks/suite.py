@@ -0,0 +1,364 @@
+"""Measures startup and lookup performance of Gestalt
+
+Runs every benchmark and prints a table, or writes the results as JSON so that runs
+of different releases can be compared. With `--compare`, the results are checked
+against an earlier JSON file, and the run fails if any benchmark got slower than the
+tolerance allows.
+
+Usage:
+    python benchmarks/suite.py [--scale F] [--repeat N] [--only GROUP]
+                               [--json PATH] [--compare PATH] [--tolerance F]
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import gestalt  # noqa: E402
+from gestalt import merge_into  # noqa: E402
+from gestalt.utils import flatten, merge_flatten  # noqa: E402
+from gestalt.vault import Vault  # noqa: E402
+from generators import (  # noqa: E402
+    deep_tree, huge_list_tree, service_tree, wide_tree, write_config)
+
+GROUPS = ('startup', 'merge', 'lookup', 'vault')
+
+
+def best_of(fn: Callable[[], Any], repeat: int, number: int = 1) -> float:
+    """Returns the best time of `repeat` runs of `number` calls to `fn`, per call"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def result(group: str, name: str, seconds: float,
+           **extra: Any) -> Dict[str, Any]:
+    return {
+        'group': group,
+        'name': name,
+        'seconds': seconds,
+        'ops_per_sec': 1 / seconds if seconds else None,
+        **extra,
+    }
+
+
+def build(path: str, lazy: bool = False, **kwargs: Any) -> gestalt.Gestalt:
+    g = gestalt.Gestalt()
+    g.add_config_path(path)
+    if lazy:
+        g.enable_lazy_loading()
+    g.build_config(**kwargs)
+    return g
+
+
+def bench_startup(scale: float, repeat: int) -> List[Dict[str, Any]]:
+    """`build_config` from scratch, for each shape of configuration, and lazily
+    followed by the read of one section for configurations of many sections
+    """
+    shapes = [
+        ('wide', lambda i: wide_tree(int(1000 * scale) or 1, i), 4, 'json'),
+        ('deep', lambda i: deep_tree(int(500 * scale) or 1, i), 4, 'json'),
+        ('many-file', lambda i: service_tree(10, i), int(500 * scale)
+         or 1, 'json'),
+        ('huge-list', lambda i: huge_list_tree(int(100000 * scale) or 1, i), 2,
+         'json'),
+        ('yaml', lambda i: service_tree(int(2000 * scale) or 1, i), 4, 'yaml'),
+    ]
+    results = []
+    for name, make, files, fmt in shapes:
+        with tempfile.TemporaryDirectory() as path:
+            write_config(path, make, files, fmt)
+            size = sum(
+                os.path.getsize(os.path.join(path, f))
+                for f in os.listdir(path))
+            seconds = best_of(lambda: build(path), repeat)
+            results.append(
+                result('startup', name, seconds, files=files, bytes=size))
+            if name in ('many-file', 'yaml'):
+                # building lazily, then reading a single section
+                seconds = best_of(
+                    lambda: build(path, lazy=True).get_int('service0.port'),
+                    repeat)
+                results.append(
+                    result('startup',
+                           f'{name} lazy',
+                           seconds,
+                           files=files,
+                           bytes=size))
+    return results
+
+
+def bench_merge(scale: float, repeat: int) -> List[Dict[str, Any]]:
+    """`merge_flatten` against `merge_into` followed by `flatten`"""
+
+    def two_phase(layers: List[Dict[str, Any]]) -> Dict[str, Any]:
+        merged: Dict[str, Any] = dict()
+        for layer in layers:
+            merge_into(layer, merged)
+        return flatten(merged)
+
+    shapes = [
+        ('wide', lambda i: wide_tree(int(1000 * scale) or 1, i)),
+        ('deep', lambda i: deep_tree(int(200 * scale) or 1, i)),
+    ]
+    results = []
+    for name, make in shapes:
+        layers = [make(i) for i in range(4)]
+        results.append(
+            result('merge', f'{name} merge_flatten',
+                   best_of(lambda: merge_flatten(layers), repeat)))
+        results.append(
+            result('merge', f'{name} merge_into+flatten',
+                   best_of(lambda: two_phase(layers), repeat)))
+    return results
+
+
+def bench_lookup(scale: float, repeat: int) -> List[Dict[str, Any]]:
+    """`get_*` calls on a configuration of mixed services"""
+    number = int(20000 * scale) or 1
+    sections = int(1000 * scale) or 1
+    results = []
+    with tempfile.TemporaryDirectory() as path:
+        write_config(path, lambda i: service_tree(sections, i), 2)
+        g = build(path)
+        g.set_default_string('only.default', 'value')
+
+        results.append(
+            result(
+                'lookup', 'hot key',
+                best_of(lambda: g.get_string('service0.name'), repeat,
+                        number)))
+        results.append(
+            result(
+                'lookup', 'nested key',
+                best_of(lambda: g.get_list('service0.hosts'), repeat, number)))
+        results.append(
+            result(
+                'lookup', 'default only',
+                best_of(lambda: g.get_string('only.default'), repeat, number)))
+
+        results.append(
+            result('lookup', 'section',
+                   best_of(lambda: g.get_section('service0'), repeat, number)))
+
+        keys = [f'service{s}.port' for s in range(sections)]
+
+        def cold() -> None:
+            for key in keys:
+                g.get_int(key)
+
+        results.append(
+            result('lookup',
+                   'cold keys',
+                   best_of(cold, repeat) / len(keys),
+                   keys=len(keys)))
+
+        cached = build(path)
+        cached.enable_cache()
+        results.append(
+            result(
+                'lookup', 'hot key cached',
+                best_of(lambda: cached.get_string('service0.name'), repeat,
+                        number)))
+
+        frozen = build(path)
+        frozen.freeze()
+        results.append(
+            result(
+                'lookup', 'hot key frozen',
+                best_of(lambda: frozen.get_string('service0.name'), repeat,
+                        number)))
+
+        with patch.dict(os.environ, {'SERVICE0_PORT': '1234'}):
+            g.auto_env()
+            results.append(
+                result(
+                    'lookup', 'env overridden',
+                    best_of(lambda: g.get_int('service0.port'), repeat,
+                            number)))
+            results.append(
+                result(
+                    'lookup', 'hot key with env',
+                    best_of(lambda: g.get_string('service0.name'), repeat,
+                            number)))
+    return results
+
+
+def bench_vault(scale: float, repeat: int) -> List[Dict[str, Any]]:
+    """Keys referencing Vault, with the Vault client stubbed out"""
+    number = int(20000 * scale) or 1
+    paths = int(100 * scale) or 1
+    results = []
+    secret = {'username': 'user', 'password': 'pass', 'db': {'port': 5432}}
+    response = {'lease_id': '', 'data': secret}
+    with patch('gestalt.vault.hvac.Client.read', return_value=response), \
+            tempfile.TemporaryDirectory() as path:
+        vault = Vault(role=None, jwt=None)
+        vault._is_connected = True
+        # a token that does not need renewing, as a connected client would hold
+        vault.kubes_token = ('kubernetes', 'token', 'accessor',
+                             '2999-01-01T00:00:00Z')
+        write_config(
+            path, lambda i: {
+                f'secret{p}': f'ref+vault://secret/data/path{p}#.password'
+                for p in range(paths)
+            }, 1)
+        g = gestalt.Gestalt()
+        g.add_config_path(path)
+        g.configure_provider('vault', vault)
+        g.build_config()
+
+        results.append(
+            result('vault', 'hot key',
+                   best_of(lambda: g.get_string('secret0'), repeat, number)))
+        results.append(
+            result(
+                'vault', 'Vault.get cached',
+                best_of(
+                    lambda: vault.get(
+                        'ref+vault://secret/data/path0#.password',
+                        'secret/data/path0', '.password'), repeat, number)))
+        results.append(
+            result(
+                'vault', 'Vault.get nested filter',
+                best_of(
+                    lambda: vault.get('ref+vault://secret/data/path0#.db.port',
+                                      'secret/data/path0', '.db.port'), repeat,
+                    number)))
+
+        def cold() -> None:
+            vault._secrets.clear()
+            vault._responses.clear()
+            for p in range(paths):
+                g.get_string(f'secret{p}')
+
+        results.append(
+            result('vault',
+                   'cold keys',
+                   best_of(cold, repeat) / paths,
+                   keys=paths))
+
+        def prefetch() -> None:
+            vault._secrets.clear()
+            vault._responses.clear()
+            g.prefetch_secrets()
+
+        results.append(
+            result('vault',
+                   'prefetch',
+                   best_of(prefetch, repeat) / paths,
+                   keys=paths))
+    return results
+
+
+BENCHMARKS: Dict[str, Callable[[float, int], List[Dict[str, Any]]]] = {
+    'startup': bench_startup,
+    'merge': bench_merge,
+    'lookup': bench_lookup,
+    'vault': bench_vault,
+}
+
+
+def environment() -> Dict[str, Any]:
+    try:
+        from importlib.metadata import version
+        gestalt_version: Optional[str] = version('gestalt-cfg')
+    except Exception:
+        gestalt_version = None
+    return {
+        'gestalt': gestalt_version,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'yaml_loader': gestalt.YAML_LOADER.__name__,
+    }
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any],
+            tolerance: float) -> List[str]:
+    """Returns the benchmarks that are more than `tolerance` slower than `baseline`
+    """
+    before = {
+        (r['group'], r['name']): r['seconds']
+        for r in baseline['results']
+    }
+    regressions = []
+    for r in results:
+        old = before.get((r['group'], r['name']))
+        if old is None:
+            continue
+        r['baseline_seconds'] = old
+        r['change'] = r['seconds'] / old - 1
+        if r['change'] > tolerance:
+            regressions.append(f"{r['group']}: {r['name']}")
+    return regressions
+
+
+def print_table(results: List[Dict[str, Any]]) -> None:
+    for r in results:
+        if r['seconds'] >= 1e-3:
+            timing = f"{r['seconds'] * 1e3:10.2f} ms"
+        else:
+            timing = f"{r['seconds'] * 1e6:10.2f} us"
+        change = ''
+        if 'change' in r:
+            change = f"  {r['change']:+.0%}"
+        print(f"{r['group']:8} {r['name']:26} {timing}{change}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('--scale',
+                        type=float,
+                        default=1.0,
+                        help='size of the configurations and iteration counts')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--only', choices=GROUPS, action='append')
+    parser.add_argument('--json', help='write the results to this file')
+    parser.add_argument('--compare', help='JSON results to compare against')
+    parser.add_argument('--tolerance',
+                        type=float,
+                        default=0.2,
+                        help='slowdown allowed by --compare, 0.2 is 20%%')
+    args = parser.parse_args()
+
+    results: List[Dict[str, Any]] = []
+    for group in args.only or GROUPS:
+        results.extend(BENCHMARKS[group](args.scale, args.repeat))
+
+    regressions: List[str] = []
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+
+    print_table(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(
+                {
+                    'environment': environment(),
+                    'scale': args.scale,
+                    'results': results
+                },
+                f,
+                indent=2)
+    if regressions:
+        print(f'{len(regressions)} benchmarks regressed by more than '
+              f'{args.tolerance:.0%}: {", ".join(regressions)}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
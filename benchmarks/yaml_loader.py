@@ -0,0 +1,59 @@
+"""Compares `build_config` startup time with the pure Python and libyaml loaders
+
+Usage:
+    python benchmarks/yaml_loader.py [--files N] [--keys N] [--repeat N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Type
+from unittest.mock import patch
+
+import yaml
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import gestalt  # noqa: E402
+from generators import service_tree, write_config  # noqa: E402
+
+
+def time_build(path: str, loader: Type[Any], repeat: int) -> float:
+    best = float('inf')
+    with patch('gestalt.YAML_LOADER', loader):
+        for _ in range(repeat):
+            g = gestalt.Gestalt()
+            g.add_config_path(path)
+            start = time.perf_counter()
+            g.build_config(max_workers=1)
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--files', type=int, default=4)
+    parser.add_argument('--keys', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as path:
+        write_config(path, lambda i: service_tree(args.keys, i), args.files,
+                     'yaml')
+        size = sum(
+            os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+        print(f'{args.files} files, {size / 1024 / 1024:.1f} MiB of YAML')
+        print(f'gestalt uses {gestalt.YAML_LOADER.__name__}')
+
+        python_time = time_build(path, yaml.FullLoader, args.repeat)
+        print(f'FullLoader:  {python_time:.3f}s')
+        if not yaml.__with_libyaml__:
+            print('PyYAML was not built with libyaml, skipping CFullLoader')
+            return
+        c_time = time_build(path, yaml.CFullLoader, args.repeat)
+        print(f'CFullLoader: {c_time:.3f}s ({python_time / c_time:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
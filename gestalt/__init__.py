@@ -1,14 +1,49 @@
-from gestalt.vault import Vault  # noqa: E999
-from gestalt.provider import Provider
+from gestalt.vault import AsyncVault, Vault  # noqa: E999,F401
+from gestalt.provider import AsyncProvider, Provider
+from gestalt.local import LocalFile  # noqa: F401
+from gestalt.metrics import Metrics
+from gestalt.watcher import Watcher
+from gestalt import binding
+import bisect
+import functools
+import logging
 import os
 import glob
-
-from typing import Dict, List, Type, Union, Optional, Text, Any
+import hashlib
+import pickle
+import tempfile
+import threading
+import time
+import weakref
+
+from typing import (Dict, List, Type, Union, Optional, Text, Any, Tuple,
+                    OrderedDict, Set, Callable)
 import yaml
 import re
 import json
+from concurrent.futures import (Executor, ProcessPoolExecutor,
+                                ThreadPoolExecutor)
+from datetime import datetime
+
+from .utils import flatten, merge_flatten  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+# The libyaml backed loader is an order of magnitude faster, but is only available
+# when PyYAML was built against libyaml
+YAML_LOADER: Type[Any] = getattr(yaml, 'CFullLoader', yaml.FullLoader)
+
+# Bumped whenever the layout of the disk cache changes
+_DISK_CACHE_VERSION = 1
 
-from .utils import flatten
+# Marks a key missing from a configuration when comparing them
+_MISSING = object()
+
+# Sources a compiled snapshot entry can be resolved from, in order of precedence
+_SOURCE_SET = 0
+_SOURCE_ENV = 1
+_SOURCE_FILE = 2
+_SOURCE_DEFAULT = 3
 
 
 def merge_into(
@@ -22,6 +57,288 @@ def merge_into(
             b[k] = v
 
 
+def _ref_filter(filter_: Optional[str], key: str,
+                key_to_search: str) -> Optional[str]:
+    """Returns the filter to read `key` with, through the provider reference stored
+    at `key_to_search`, which is either `key` or one of its prefixes
+    """
+    remainder_filter = key[len(key_to_search):]
+    if len(remainder_filter) > 1:
+        if filter_ is not None:
+            return f".{filter_}{remainder_filter}"
+        return remainder_filter
+    return filter_
+
+
+def _file_signature(path: str) -> Tuple[int, int]:
+    """Returns the modification time and size of `path`"""
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _load_file(path: str) -> Dict[Text, Any]:
+    """Parses a JSON or YAML configuration file, based on its extension
+
+    Raises:
+        ValueError: If the file cannot be read as the format its extension indicates
+    """
+    if path.endswith('json'):
+        with open(path) as jf:
+            try:
+                json_dict: Dict[Text, Any] = json.load(jf)
+                return json_dict
+            except json.JSONDecodeError as e:
+                raise ValueError(
+                    f'File {path} is marked as ".json" but cannot be read as such: {e}'
+                )
+    with open(path) as yf:
+        try:
+            yaml_dict: Dict[Text, Any] = yaml.load(yf, Loader=YAML_LOADER)
+            return yaml_dict
+        except yaml.YAMLError as e:
+            raise ValueError(
+                f'File {path} is marked as ".yaml" but cannot be read as such: {e}'
+            )
+
+
+class _Section:
+    """A top-level key of a configuration file, loaded on first use
+
+    Holds either the parsed value of the key, or the text of the YAML file and the
+    `start` and `end` offsets of the span of that text the key is written in, which
+    is parsed when loaded.
+    """
+    __slots__ = ('path', 'key', 'value', 'text', 'start', 'end')
+
+    def __init__(self,
+                 path: str,
+                 key: Text,
+                 value: Any = None,
+                 text: Optional[str] = None,
+                 start: int = 0,
+                 end: int = 0) -> None:
+        self.path = path
+        self.key = key
+        self.value = value
+        self.text = text
+        self.start = start
+        self.end = end
+
+    def load(self) -> Dict[Text, Any]:
+        """Returns the key and its value as a single key dictionary
+
+        If the span of the key cannot be read on its own, the whole file is parsed.
+
+        Raises:
+            ValueError: If the file cannot be read as YAML
+        """
+        if self.text is None:
+            return {self.key: self.value}
+        try:
+            layer = yaml.load(self.text[self.start:self.end],
+                              Loader=YAML_LOADER)
+        except yaml.YAMLError:
+            layer = None
+        if isinstance(layer, dict) and list(layer) == [self.key]:
+            return layer
+        # the span did not hold the key on its own after all
+        try:
+            document = yaml.load(self.text, Loader=YAML_LOADER)
+        except yaml.YAMLError as e:
+            raise ValueError(
+                f'File {self.path} is marked as ".yaml" but cannot be read as such: {e}'
+            )
+        return {self.key: document[self.key]}
+
+
+# A top-level YAML key that parses as a string, and anchors or aliases, which can tie
+# the values of several keys together
+_YAML_KEY = re.compile(r'([A-Za-z_][\w\-]*)[ \t]*:(?=\s|$)')
+_YAML_ALIAS = re.compile(r'(?:^|[\s,\[{])[&*][^\s,\[\]{}]', re.M)
+_YAML_LINE = re.compile(r'^[^\s#].*$', re.M)
+# A value after a top-level key that cannot continue on the next top-level line: none
+# for a block, a block scalar header, or a scalar or flat collection ending on its line
+_YAML_ONE_LINE = re.compile(
+    r"""(?:
+    |[|>][-+0-9]*
+    |"(?:[^"\\]|\\.)*"
+    |'(?:[^']|'')*'
+    |\[[^\[\]{}"'\#]*\]
+    |\{[^\[\]{}"'\#]*\}
+    |[^\s"'\[\]{}|>!%@`\#?:,&*][^\#]*?
+)(?:\s+\#.*|\s*)""", re.X)
+_YAML_NON_STRINGS = {
+    'y', 'n', 'yes', 'no', 'on', 'off', 'true', 'false', 'null'
+}
+
+
+def _split_yaml(text: str) -> Optional[Dict[Text, Tuple[int, int]]]:
+    """Finds the span of text each top-level key of a YAML document is written in
+
+    Only block mappings whose top-level keys are plain names, whose top-level
+    values are blocks or end on the line of their key, and which use no anchors or
+    aliases, are split. Returns None for any other document.
+    """
+    if _YAML_ALIAS.search(text):
+        return None
+    spans: Dict[Text, Tuple[int, int]] = dict()
+    key: Optional[str] = None
+    start = 0
+    for line in _YAML_LINE.finditer(text):
+        m = _YAML_KEY.match(line.group())
+        if m is None or m.group(1).lower() in _YAML_NON_STRINGS:
+            return None
+        if not _YAML_ONE_LINE.fullmatch(line.group()[m.end():].strip()):
+            return None
+        if key is not None:
+            spans[key] = (start, line.start())
+        key, start = m.group(1), line.start()
+        if key in spans:
+            return None
+    if key is not None:
+        spans[key] = (start, len(text))
+    return spans
+
+
+def _index_file(path: str) -> List[_Section]:
+    """Lists the top-level keys of a configuration file, in the order they are written
+
+    YAML files are split into the text of each key, JSON files, and YAML files that
+    cannot be split, are parsed.
+
+    Raises:
+        ValueError: If the file cannot be read as the format its extension indicates
+    """
+    if not path.endswith('json'):
+        with open(path) as yf:
+            text = yf.read()
+        spans = _split_yaml(text)
+        if spans is not None:
+            return [
+                _Section(path, key, text=text, start=start, end=end)
+                for key, (start, end) in spans.items()
+            ]
+    layer = _load_file(path) or dict()
+    return [_Section(path, key, value=value) for key, value in layer.items()]
+
+
+def _file_hash(path: str) -> str:
+    """Returns the SHA-256 digest of the content of `path`"""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _read_disk_cache(path: str) -> Optional[Dict[str, Any]]:
+    """Reads a cache written by `_write_disk_cache`, or None if it cannot be used"""
+    try:
+        with open(path, 'rb') as f:
+            cached = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError,
+            ImportError):
+        return None
+    if not isinstance(cached,
+                      dict) or cached.get('version') != _DISK_CACHE_VERSION:
+        return None
+    return cached
+
+
+def _write_disk_cache(path: str, sources: Dict[str, Tuple[Tuple[int, int],
+                                                          str]],
+                      layers: Dict[str, Dict[Text, Any]],
+                      data: Dict[Text, Any]) -> None:
+    """Atomically writes the parsed `layers` and rendered `data` of `sources`"""
+    cached = {
+        'version': _DISK_CACHE_VERSION,
+        'files': sources,
+        'layers': layers,
+        'data': data,
+    }
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(cached, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _same_value(a: Any, b: Any) -> bool:
+    """Compares configuration values, telling apart equal values of other types"""
+    return type(a) is type(b) and a == b
+
+
+class _State:
+    """A consistent view of the configuration
+
+    Lookups read the state through a single reference, and writers replace that
+    reference with a new state instead of modifying the current one, so lookups never
+    observe a partial update and never need to take a lock. The environment overlay,
+    the compiled snapshot and the lookup cache are derived from the rest of the state,
+    and are filled in lazily by whichever lookup needs them first.
+    """
+    __slots__ = ('data', 'sets', 'defaults', 'secret_map', 'refs', 'use_env',
+                 'env', 'env_converted', 'snapshot', 'index', 'cache',
+                 'pending')
+
+    def __init__(self, data: Dict[Text, Union[List[Any], Text, int, bool,
+                                              float]],
+                 sets: Dict[Text, Union[List[Any], Text, int, bool, float]],
+                 defaults: Dict[Text,
+                                Union[List[Any], Text, int, bool,
+                                      float]], secret_map: Dict[str,
+                                                                List[str]],
+                 refs: Dict[str, Tuple[str, str, Optional[str]]],
+                 use_env: bool, env: Optional[Dict[str, str]],
+                 env_converted: Dict[Tuple[str, Type[Any]],
+                                     Union[List[Any], Text, int, bool, float]],
+                 cache: Optional[OrderedDict[Tuple[str, Type[Any], Any],
+                                             Tuple[Union[List[Any], Text, int,
+                                                         bool, float],
+                                                   Optional[datetime]]]],
+                 pending: Dict[str, List[_Section]]) -> None:
+        self.data = data
+        self.sets = sets
+        self.defaults = defaults
+        self.secret_map = secret_map
+        # provider name, path and filter of every reference in the data
+        self.refs = refs
+        self.use_env = use_env
+        self.env = env
+        self.env_converted = env_converted
+        self.cache = cache
+        # sections of the configuration files that were not loaded yet, by the
+        # top-level key they are read under
+        self.pending = pending
+        self.snapshot: Optional[Dict[Text, Tuple[Union[List[Any], Text, int,
+                                                       bool, float],
+                                                 int]]] = None
+        # every known key in sorted order, so that the keys of a section are a
+        # contiguous range
+        self.index: Optional[List[str]] = None
+
+    def evolve(self, **changes: Any) -> '_State':
+        """Returns a copy of the state with `changes` applied
+
+        The snapshot, the key index and the lookup cache are not carried over, as they
+        may not hold for the new state.
+        """
+        fields: Dict[str, Any] = {
+            'data': self.data,
+            'sets': self.sets,
+            'defaults': self.defaults,
+            'secret_map': self.secret_map,
+            'refs': self.refs,
+            'use_env': self.use_env,
+            'env': self.env,
+            'env_converted': self.env_converted,
+            'cache': OrderedDict() if self.cache is not None else None,
+            'pending': self.pending,
+        }
+        fields.update(changes)
+        return _State(**fields)
+
+
 class Gestalt:
 
     def __init__(self) -> None:
@@ -35,22 +352,43 @@ class Gestalt:
          - Configuration delimiter is '.'
          - No environment variables prefix
         """
-        self.__conf_data: Dict[Text, Union[List[Any], Text, int, bool,
-                                           float]] = dict()
         self.__conf_file_name: Text = '*'
         self.__conf_file_paths: List[str] = []
         self.__conf_files: List[str] = []
-        self.__use_env: bool = False
+        self.__file_layers: Dict[str, Tuple[Tuple[int, int],
+                                            Dict[Text, Any]]] = dict()
+        self.__disk_cache_dir: Optional[str] = None
+        self.__lazy: bool = False
+        self.__file_index: Dict[str, Tuple[Tuple[int, int],
+                                           List[_Section]]] = dict()
+        self.__built_files: List[str] = []
+        self.__write_lock = threading.RLock()
+        self.__watcher: Optional[Watcher] = None
+        self.__change_callbacks: List[Callable[[Set[str]], None]] = []
+        self.__env_keys: Dict[str, str] = dict()
         self.__env_prefix: Text = ''
         self.__delim_char: Text = '.'
-        self.__conf_sets: Dict[Text, Union[List[Any], Text, int, bool,
-                                           float]] = dict()
-        self.__conf_defaults: Dict[Text, Union[List[Any], Text, int, bool,
-                                               float]] = dict()
+        self.__state = _State(data=dict(),
+                              sets=dict(),
+                              defaults=dict(),
+                              secret_map=dict(),
+                              refs=dict(),
+                              use_env=False,
+                              env=None,
+                              env_converted=dict(),
+                              cache=None,
+                              pending=dict())
         self.providers: Dict[str, Provider] = dict()
-        self.__secret_map: Dict[str, List[str]] = {}
+        self.async_providers: Dict[str, AsyncProvider] = dict()
         self.regex_pattern = re.compile(
             r"^ref\+([^\+]*)://([^(\+)]+)\#([^\+]+)?$")
+        self.__frozen: bool = False
+        self.__cache_max_size: int = 0
+        self.__cache_hits: int = 0
+        self.__cache_misses: int = 0
+        self.__metrics: Optional[Metrics] = None
+        # instances returned by `bind`, with their schema and prefix
+        self.__bindings: List[Tuple[Callable[[], Any], type, str]] = []
 
     def add_config_path(self, path: str) -> None:
         """Adds a path to read configs from.
@@ -99,67 +437,392 @@ class Gestalt:
             raise ValueError(f'Given file path of {tmp} is not a file')
         self.__conf_files.append(tmp)
 
-    def build_config(self) -> None:
+    def build_config(self,
+                     max_workers: Optional[int] = None,
+                     use_processes: bool = False) -> None:
         """Renders all configuration paths into the internal data structure.
 
         This does not affect if environment variables are used, it just deals
         with the files that need to be loaded.
+
+        Files are parsed concurrently and then merged in the documented order, so the
+        result is the same as loading them one after the other. Parsed files are kept
+        in memory and only parsed again if their modification time or size change.
+
+        Args:
+            max_workers (Optional: int): Maximum number of files to parse at once, the
+                default of the executor is used if not provided
+            use_processes (bool): Parse files in a process pool instead of a thread pool
+
+        Raises:
+            ValueError: If a file cannot be read as the format its extension indicates
+        """
+        with self.__write_lock:
+            files = self.__config_files()
+            state = self.__state
+            data = dict(state.data)
+            pending: Dict[str, List[_Section]] = dict()
+            if self.__lazy:
+                pending = self.__index_files(files, max_workers, use_processes)
+            else:
+                data.update(self.__render(files, max_workers, use_processes))
+            self.__built_files = files
+            self.__swap_data(data, pending)
+            self.__rebind()
+
+    def rebuild_config(self,
+                       max_workers: Optional[int] = None,
+                       use_processes: bool = False) -> Set[str]:
+        """Reloads the configuration files that changed since they were last loaded
+
+        Configuration paths are listed again, so added and removed files are picked up.
+        Only the files whose modification time or size changed are parsed again, and
+        the configuration is then rendered from scratch out of the parsed files, so
+        keys removed from the files are removed from the configuration as well. Values
+        given to `set_*` and `set_default_*` are kept.
+
+        With lazy loading, the sections that were loaded are loaded again right away,
+        and the others stay unloaded, so changes to them are not reported.
+
+        Args:
+            max_workers (Optional: int): Maximum number of files to parse at once, the
+                default of the executor is used if not provided
+            use_processes (bool): Parse files in a process pool instead of a thread pool
+
+        Returns:
+            set: The keys that were added, removed or changed value in the files
+
+        Raises:
+            ValueError: If a file cannot be read as the format its extension indicates
+        """
+        with self.__write_lock:
+            files = self.__config_files()
+            parsed = self.__file_index if self.__lazy else self.__file_layers
+            if files == self.__built_files and all(
+                    f in parsed and parsed[f][0] == _file_signature(f)
+                    for f in files):
+                return set()
+
+            for f in set(parsed) - set(files):
+                del parsed[f]
+            data = self.__state.data
+            pending: Dict[str, List[_Section]] = dict()
+            if self.__lazy:
+                pending = self.__index_files(files, max_workers, use_processes)
+                loaded = {k.split(self.__delim_char, 1)[0]
+                          for k in data} & pending.keys()
+                file_data = self.__render_sections(pending, loaded)
+                pending = {
+                    name: sections
+                    for name, sections in pending.items() if name not in loaded
+                }
+            else:
+                file_data = self.__render(files, max_workers, use_processes)
+            changed = {
+                k
+                for k in data.keys() | file_data.keys() if not _same_value(
+                    data.get(k, _MISSING), file_data.get(k, _MISSING))
+            }
+            self.__built_files = files
+            self.__swap_data(file_data, pending)
+            self.__rebind()
+            return changed
+
+    def __swap_data(self, data: Dict[Text, Union[List[Any], Text, int, bool,
+                                                 float]],
+                    pending: Dict[str, List[_Section]]) -> None:
+        """Replaces the file configuration and the sections left to load, must be
+        called with the write lock held
+
+        Raises:
+            RuntimeError: If a value references a provider that is not configured
+        """
+        state = self.__state
+        secret_map: Dict[str, List[str]] = dict()
+        refs: Dict[str, Tuple[str, str, Optional[str]]] = dict()
+        self.__parse_dictionary_keys(data, secret_map, refs)
+        self.__parse_dictionary_keys(state.sets, secret_map, dict())
+        self.__state = state.evolve(data=data,
+                                    secret_map=secret_map,
+                                    refs=refs,
+                                    pending=pending)
+
+    def __load_sections(self, state: _State, key: Optional[str]) -> _State:
+        """Loads the pending section `key` belongs to, or every pending section if
+        `key` is None, and returns the state holding them
+
+        Raises:
+            ValueError: If a section cannot be parsed
+            RuntimeError: If a value references a provider that is not configured
+        """
+        if not state.pending:
+            return state
+        name = key.split(self.__delim_char, 1)[0] if key is not None else None
+        if name is not None and name not in state.pending:
+            return state
+        with self.__write_lock:
+            state = self.__state
+            if name is None:
+                names = set(state.pending)
+            else:
+                names = {name} & state.pending.keys()
+            if not names:
+                return state
+            file_data = self.__render_sections(state.pending, names)
+            data = dict(state.data)
+            data.update(file_data)
+            secret_map = {
+                ref: list(keys)
+                for ref, keys in state.secret_map.items()
+            }
+            refs = dict(state.refs)
+            self.__parse_dictionary_keys(file_data, secret_map, refs)
+            self.__state = state.evolve(
+                data=data,
+                secret_map=secret_map,
+                refs=refs,
+                pending={
+                    n: sections
+                    for n, sections in state.pending.items() if n not in names
+                })
+            return self.__state
+
+    def __render_sections(self, pending: Dict[str, List[_Section]],
+                          names: Set[str]) -> Dict[Text, Any]:
+        """Parses, merges and flattens the pending sections `names`
+        """
+        return merge_flatten(
+            [section.load() for name in names for section in pending[name]],
+            sep=self.__delim_char)
+
+    def watch(self,
+              debounce: float = 0.5,
+              poll_interval: float = 1.0,
+              use_inotify: bool = True) -> None:
+        """Reloads configuration files in the background when they change
+
+        Configuration paths and files are watched with inotify on Linux, and polled
+        otherwise. Once changes settle for `debounce` seconds, `rebuild_config` reloads
+        the files that changed and the callbacks registered with `on_change` are called
+        with the keys that changed. Errors while reloading are logged and the previous
+        configuration is kept.
+
+        Args:
+            debounce (float): Seconds without changes to wait for before reloading
+            poll_interval (float): Seconds between checks when polling
+            use_inotify (bool): Use inotify when available, poll otherwise
+
+        Raises:
+            RuntimeError: If the configuration is already being watched
+        """
+        if self.__watcher is not None:
+            raise RuntimeError(
+                'Gestalt Error: Configuration is already being watched')
+        self.__watcher = Watcher(self.__conf_file_paths + self.__conf_files,
+                                 self.__reload,
+                                 debounce=debounce,
+                                 poll_interval=poll_interval,
+                                 use_inotify=use_inotify)
+        self.__watcher.start()
+
+    def stop_watching(self) -> None:
+        """Stops watching configuration files for changes
+        """
+        if self.__watcher is not None:
+            self.__watcher.stop()
+            self.__watcher = None
+
+    def on_change(self, callback: Callable[[Set[str]], None]) -> None:
+        """Registers a callback to call after a reload changes the configuration
+
+        Args:
+            callback (Callable): Called with the set of keys that changed
+        """
+        self.__change_callbacks.append(callback)
+
+    def __reload(self) -> None:
+        changed = self.rebuild_config()
+        if not changed:
+            return
+        logger.info(f"Reloaded configuration, {len(changed)} keys changed")
+        for callback in list(self.__change_callbacks):
+            try:
+                callback(changed)
+            except Exception:
+                logger.exception(
+                    "Gestalt Error: Configuration change callback failed")
+
+    def __render(self, files: List[str], max_workers: Optional[int],
+                 use_processes: bool) -> Dict[Text, Any]:
+        if self.__disk_cache_dir is None:
+            return self.__render_files(files, max_workers, use_processes)
+        return self.__render_files_cached(files, max_workers, use_processes)
+
+    def enable_disk_cache(self, cache_dir: str) -> None:
+        """Persists the rendered configuration files across processes
+
+        `build_config` stores the parsed files and the flattened configuration in
+        `cache_dir`, keyed by the list of files loaded. A later `build_config` over the
+        same files, in this or another process, reuses the flattened configuration when
+        none of the files changed, and only parses the files that did otherwise. Files
+        are considered changed when their content hash changes, which is only computed
+        when their modification time or size differ from the cached ones.
+
+        The cache is stored with `pickle`, so `cache_dir` must not be writable by
+        untrusted users.
+
+        Args:
+            cache_dir (str): Directory to store the cache in, created if it does not exist
+        """
+        tmp = os.path.abspath(os.path.expandvars(cache_dir))
+        os.makedirs(tmp, exist_ok=True)
+        self.__disk_cache_dir = tmp
+
+    def enable_lazy_loading(self) -> None:
+        """Defers loading each section of the configuration files until it is read
+
+        `build_config` and `rebuild_config` then only index the top-level keys of
+        every file, and the keys under a top-level key are parsed, merged and
+        flattened by the first lookup of a key under it, so processes reading a few
+        sections of a large configuration only pay for those. YAML files are split
+        into the text of each top-level key and only that text is parsed. JSON files,
+        and YAML files that use anchors, hold several documents or have top-level keys
+        that are not plain names, are parsed up front, but their sections are still
+        merged and flattened lazily.
+
+        Errors in a section, such as a reference to a provider that is not
+        configured, are raised by the first lookup under it instead of by
+        `build_config`. `get_section('')`, `freeze`, `dump`, `prefetch_secrets` and
+        `unused_keys` load every section. The disk cache is not used while lazy
+        loading is enabled.
+        """
+        with self.__write_lock:
+            self.__lazy = True
+
+    def __render_files(self, files: List[str], max_workers: Optional[int],
+                       use_processes: bool) -> Dict[Text, Any]:
+        """Parses, merges and flattens `files` into a single dictionary
+        """
+        return merge_flatten(self.__load_files(files, max_workers,
+                                               use_processes),
+                             sep=self.__delim_char)
+
+    def __render_files_cached(self, files: List[str],
+                              max_workers: Optional[int],
+                              use_processes: bool) -> Dict[Text, Any]:
+        """Renders `files` like `__render_files`, going through the disk cache
+        """
+        assert self.__disk_cache_dir is not None
+        key = hashlib.sha256('\0'.join([self.__delim_char] +
+                                       files).encode()).hexdigest()
+        cache_path = os.path.join(self.__disk_cache_dir,
+                                  f'gestalt-{key}.pickle')
+        cached = _read_disk_cache(cache_path)
+        cached_files = cached['files'] if cached is not None else dict()
+
+        sources: Dict[str, Tuple[Tuple[int, int], str]] = dict()
+        unchanged = cached is not None
+        for f in files:
+            signature = _file_signature(f)
+            cached_signature, cached_hash = cached_files.get(f, (None, None))
+            if signature == cached_signature:
+                content_hash = cached_hash
+            else:
+                content_hash = _file_hash(f)
+            sources[f] = (signature, content_hash)
+            if cached is not None and content_hash == cached_hash:
+                # the content did not change, there is no need to parse it again
+                self.__file_layers[f] = (signature, cached['layers'][f])
+            else:
+                unchanged = False
+
+        if cached is not None and unchanged:
+            file_data: Dict[Text, Any] = cached['data']
+            if any(sources[f][0] != cached_files[f][0] for f in files):
+                _write_disk_cache(cache_path, sources, cached['layers'],
+                                  file_data)
+            return file_data
+
+        file_data = self.__render_files(files, max_workers, use_processes)
+        layers = {f: self.__file_layers[f][1] for f in files}
+        _write_disk_cache(cache_path, sources, layers, file_data)
+        return file_data
+
+    def __config_files(self) -> List[str]:
+        """Lists the configuration files to load, in the order they are merged in
         """
+        files: List[str] = []
         for p in self.__conf_file_paths:
             json_files = glob.glob(p + f'/{self.__conf_file_name}.json')
             json_files.sort()
             yaml_files = glob.glob(p + f'/{self.__conf_file_name}.yaml')
             yaml_files.sort()
-            for json_file in json_files:
-                with open(json_file) as jf:
-                    try:
-                        json_dict = json.load(jf)
-                        merge_into(json_dict, self.__conf_data)
-                    except json.JSONDecodeError as e:
-                        raise ValueError(
-                            f'File {json_file} is marked as ".json" but cannot be read as such: {e}'
-                        )
-            for yaml_file in yaml_files:
-                with open(yaml_file) as yf:
-                    try:
-                        yaml_dict = yaml.load(yf, Loader=yaml.FullLoader)
-                        merge_into(yaml_dict, self.__conf_data)
-                    except yaml.YAMLError as e:
-                        raise ValueError(
-                            f'File {yaml_file} is marked as ".yaml" but cannot be read as such: {e}'
-                        )
-
+            files.extend(json_files)
+            files.extend(yaml_files)
         for f in self.__conf_files:
-            f_ext = f[-4:]
-            if f_ext == 'json':
-                try:
-                    with open(f) as jf:
-                        json_dict = json.load(jf)
-                        merge_into(json_dict, self.__conf_data)
-                except json.JSONDecodeError as e:
-                    raise ValueError(
-                        f'File {f} is marked as ".json" but cannot be read as such: {e}'
-                    )
-            elif f_ext == 'yaml':
-                try:
-                    with open(f) as yf:
-                        yaml_dict = yaml.load(yf, Loader=yaml.FullLoader)
-                        merge_into(yaml_dict, self.__conf_data)
-                except yaml.YAMLError as e:
-                    raise ValueError(
-                        f'File {f} is marked as ".yaml" but cannot be read as such: {e}'
-                    )
+            if f[-4:] in ('json', 'yaml'):
+                files.append(f)
+        return files
 
-        self.__conf_data = flatten(self.__conf_data, sep=self.__delim_char)
-
-        self.__parse_dictionary_keys(self.__conf_data)
-        self.__parse_dictionary_keys(self.__conf_sets)
+    def __load_files(self, files: List[str], max_workers: Optional[int],
+                     use_processes: bool) -> List[Dict[Text, Any]]:
+        """Parses `files`, reusing the files that did not change since they were parsed
+        """
+        self.__parse_stale(files, self.__file_layers, _load_file, max_workers,
+                           use_processes)
+        return [self.__file_layers[f][1] for f in files]
+
+    def __index_files(self, files: List[str], max_workers: Optional[int],
+                      use_processes: bool) -> Dict[str, List[_Section]]:
+        """Indexes the sections of `files` by the top-level key they are read under,
+        in the order they are merged in
+        """
+        self.__parse_stale(files, self.__file_index, _index_file, max_workers,
+                           use_processes)
+        pending: Dict[str, List[_Section]] = dict()
+        for f in files:
+            for section in self.__file_index[f][1]:
+                name = section.key.split(self.__delim_char, 1)[0]
+                pending.setdefault(name, []).append(section)
+        return pending
+
+    def __parse_stale(self, files: List[str],
+                      parsed: Dict[str, Tuple[Tuple[int, int],
+                                              Any]], parse: Callable[[str],
+                                                                     Any],
+                      max_workers: Optional[int], use_processes: bool) -> None:
+        """Parses the `files` that changed since they were stored in `parsed`
+        """
+        signatures = {f: _file_signature(f) for f in files}
+        stale = [
+            f for f, sig in signatures.items()
+            if f not in parsed or parsed[f][0] != sig
+        ]
+        if len(stale) > 1 and max_workers != 1:
+            executor: Executor
+            if use_processes:
+                executor = ProcessPoolExecutor(max_workers=max_workers)
+            else:
+                executor = ThreadPoolExecutor(max_workers=max_workers)
+            with executor:
+                results = list(executor.map(parse, stale))
+        else:
+            results = [parse(f) for f in stale]
+        for f, result in zip(stale, results):
+            parsed[f] = (signatures[f], result)
 
     def __parse_dictionary_keys(
-        self, dictionary: Dict[str, Union[List[Any], str, int, bool,
-                                          float]]) -> None:
+            self, dictionary: Dict[str,
+                                   Union[List[Any], str, int, bool,
+                                         float]], secret_map: Dict[str,
+                                                                   List[str]],
+            refs: Dict[str, Tuple[str, str, Optional[str]]]) -> None:
         """Parses the keys in the configuration data.
 
+        Every provider reference is recorded in `secret_map` with the keys holding it,
+        and in `refs` with its provider name, path and filter, so lookups dispatch to
+        the provider without parsing the reference again.
+
         Raises:
             RuntimeError: If the configuration data is not valid
         """
@@ -172,26 +835,79 @@ class Gestalt:
             if m.group(1) not in self.providers:
                 raise RuntimeError(
                     "Provider not configured yet expect to be used")
-            if v in self.__secret_map:
-                self.__secret_map[v].append(k)
+            if v in secret_map:
+                secret_map[v].append(k)
             else:
-                self.__secret_map.update({v: [k]})
+                secret_map.update({v: [k]})
+            refs[v] = (m.group(1), m.group(2), m.group(3))
 
     def configure_provider(self, provider_name: str,
-                           provider: Provider) -> None:
+                           provider: Union[Provider, AsyncProvider]) -> None:
         """Configures a provider for use in the library.
 
+        Providers are registered by name, and values of the form
+        `ref+<provider_name>://path#filter` are read from the provider registered
+        under that name, so the scheme of the provider must match its name.
+
+        An `AsyncVault` is used by the `aget_*` methods, and the `Vault` it wraps by
+        the `get_*` methods.
+
         Args:
             provider_name (str): The name of the provider to configure
             provider (Provider): The provider to configure
 
         Raises:
             TypeError: If the provider is not an instance of the Provider class
+            ValueError: If the scheme of the provider does not match `provider_name`
         """
-        if provider_name == "vault" and isinstance(provider, Vault):
-            self.providers.update({"vault": provider})
+        sync_provider: Provider
+        async_provider: Optional[AsyncProvider]
+        if isinstance(provider, AsyncVault):
+            sync_provider, async_provider = provider.vault, provider
+        elif isinstance(provider, Provider):
+            sync_provider, async_provider = provider, None
         else:
             raise TypeError("Provider provider is not supported")
+        if provider.scheme != f"ref+{provider_name}://":
+            raise ValueError(
+                f"Provider scheme {provider.scheme} does not match the name "
+                f"{provider_name}, expected ref+{provider_name}://")
+        with self.__write_lock:
+            # copied rather than updated, lookups may be iterating over them
+            self.providers = {**self.providers, provider_name: sync_provider}
+            async_providers = dict(self.async_providers)
+            async_providers.pop(provider_name, None)
+            if async_provider is not None:
+                async_providers[provider_name] = async_provider
+            self.async_providers = async_providers
+            self.__state = self.__state.evolve()
+        if self.__metrics is not None:
+            sync_provider.enable_metrics(self.__metrics)
+
+    def prefetch_secrets(self, max_workers: Optional[int] = None) -> None:
+        """Fetches every provider reference in the configuration ahead of time
+
+        Secrets are otherwise fetched one by one on their first lookup. Calling this
+        after `build_config` and before serving fills the provider caches up front, with
+        providers fetching each distinct path once, concurrently when they support it.
+
+        Args:
+            max_workers (Optional: int): Maximum number of concurrent fetches per
+                provider, the default of the executor is used if not provided
+
+        Raises:
+            RuntimeError: If a secret cannot be fetched
+        """
+        state = self.__load_sections(self.__state, None)
+        providers = self.providers
+        refs: Dict[str, List[Tuple[str, str, Optional[str]]]] = dict()
+        for ref, (name, path, filter_) in state.refs.items():
+            if name in providers:
+                refs.setdefault(name, []).append((ref, path, filter_))
+        for name, provider_refs in refs.items():
+            providers[name].prefetch(provider_refs,
+                                     sep=self.__delim_char,
+                                     max_workers=max_workers)
 
     def auto_env(self) -> None:
         """Auto env provides sane defaults for using environment variables
@@ -199,8 +915,221 @@ class Gestalt:
         Specifically, auto_env will enable the use of environment variables and
         will also clear the prefix for environment variables.
         """
-        self.__use_env = True
-        self.__env_prefix = ''
+        with self.__write_lock:
+            self.__env_prefix = ''
+            self.__env_keys = dict()
+            self.__state = self.__state.evolve(use_env=True,
+                                               env=None,
+                                               env_converted=dict())
+
+    def refresh_env(self) -> None:
+        """Re-reads the environment variables used for overrides
+
+        The environment is read once, on the first lookup that needs it, and converted
+        values are reused afterwards. Processes that change their own environment after
+        that need to call this to pick up the changes.
+        """
+        with self.__write_lock:
+            self.__state = self.__state.evolve(env=None, env_converted=dict())
+
+    def __env_lookup(self, state: _State, key: str) -> Optional[str]:
+        """Returns the name of the environment variable overriding `key`, if it is set
+        """
+        env = state.env
+        if env is None:
+            env = {
+                k: v
+                for k, v in os.environ.items()
+                if k.startswith(self.__env_prefix)
+            }
+            state.env = env
+        e_key = self.__env_keys.get(key)
+        if e_key is None:
+            e_key = self.__env_prefix + key.upper().replace(
+                self.__delim_char, '_')
+            self.__env_keys[key] = e_key
+        if e_key in env:
+            return e_key
+        return None
+
+    def __coerce_env(
+        self, state: _State, e_key: str, t: Type[Union[str, int, float, bool,
+                                                       List[Any]]]
+    ) -> Union[str, int, float, bool, List[Any]]:
+        converted = state.env_converted.get((e_key, t))
+        if converted is not None:
+            return converted
+        assert state.env is not None
+        try:
+            converted = t(state.env[e_key])
+        except ValueError as e:
+            raise TypeError(
+                f'The environment variable {e_key} could not be converted to type {t}: {e}'
+            )
+        state.env_converted[(e_key, t)] = converted
+        return converted
+
+    def freeze(self) -> None:
+        """Enables compiled lookups for all configuration keys
+
+        Once frozen, every known key is resolved ahead of time into a single precedence
+        merged snapshot (sets, then environment variables, then config files, then set
+        defaults), so that a `get_*` call costs a single dictionary lookup and a type
+        check. The snapshot is rebuilt on the next `get_*` after `build_config`, `set_*`
+        or `set_default_*` are called.
+
+        Keys resolved through a provider, and keys that are not in any configuration,
+        keep using the regular lookup.
+        """
+        state = self.__load_sections(self.__state, None)
+        state.snapshot = self.__compile_snapshot(state)
+        self.__frozen = True
+
+    def enable_cache(self, max_size: int = 1024) -> None:
+        """Enables memoization of `get_*` results
+
+        Results are cached per key, type and default, and the least recently used
+        entries are evicted once `max_size` entries are stored. The cache is cleared
+        whenever `build_config`, `set_*`, `set_default_*` or `configure_provider` are
+        called, and values resolved through a provider are dropped once the provider
+        reports them as expired.
+
+        Args:
+            max_size (int): Maximum number of entries to keep in the cache
+
+        Raises:
+            ValueError: If `max_size` is not a positive number
+        """
+        if max_size <= 0:
+            raise ValueError(
+                f'Cache size must be a positive number, got {max_size}')
+        with self.__write_lock:
+            self.__cache_max_size = max_size
+            self.__cache_hits = 0
+            self.__cache_misses = 0
+            self.__state = self.__state.evolve(cache=OrderedDict())
+
+    def clear_cache(self) -> None:
+        """Drops every memoized `get_*` result
+        """
+        cache = self.__state.cache
+        if cache is not None:
+            cache.clear()
+
+    def cache_info(self) -> Dict[str, int]:
+        """Returns the hit, miss and size counters of the `get_*` cache
+
+        Returns:
+            dict: The `hits`, `misses`, `size` and `max_size` of the cache
+        """
+        cache = self.__state.cache
+        return {
+            'hits': self.__cache_hits,
+            'misses': self.__cache_misses,
+            'size': len(cache) if cache is not None else 0,
+            'max_size': self.__cache_max_size,
+        }
+
+    def enable_metrics(self, metrics: Optional[Metrics] = None) -> Metrics:
+        """Records how keys are read and how providers are called
+
+        Every `get_*` call is counted per key and timed, and the configured providers,
+        as well as providers configured later, record their fetches and cache lookups
+        into the same metrics. Metrics are off by default, lookups then skip the
+        bookkeeping entirely.
+
+        Args:
+            metrics (Optional: Metrics): The metrics to record into, new metrics are
+                created if not provided
+
+        Returns:
+            Metrics: The metrics being recorded into
+        """
+        if metrics is None:
+            metrics = Metrics()
+
+        def collect() -> Dict[str, Any]:
+            if self.__state.cache is None:
+                return dict()
+            return {
+                'caches': {
+                    'lookup': {
+                        'hits': self.__cache_hits,
+                        'misses': self.__cache_misses
+                    }
+                }
+            }
+
+        metrics.add_collector(collect)
+        with self.__write_lock:
+            for provider in self.providers.values():
+                provider.enable_metrics(metrics)
+            self.__metrics = metrics
+        return metrics
+
+    def unused_keys(self) -> List[str]:
+        """Returns the keys of the configuration that were never read
+
+        Keys from configuration files, `set_*` and `set_default_*` are reported
+        when no `get_*` call read them, or a key nested under them, since metrics
+        were enabled.
+
+        Raises:
+            RuntimeError: If metrics are not enabled
+        """
+        if self.__metrics is None:
+            raise RuntimeError(
+                'Gestalt Error: Metrics must be enabled with enable_metrics to '
+                'report unused keys')
+        state = self.__load_sections(self.__state, None)
+        return self.__metrics.unused_keys(
+            state.data.keys() | state.sets.keys() | state.defaults.keys(),
+            sep=self.__delim_char)
+
+    def unfreeze(self) -> None:
+        """Disables compiled lookups and drops the current snapshot
+        """
+        self.__frozen = False
+        self.__state.snapshot = None
+
+    def __compile_snapshot(
+        self, state: _State
+    ) -> Dict[Text, Tuple[Union[List[Any], Text, int, bool, float], int]]:
+        keys = set(state.defaults)
+        keys.update(state.data)
+        keys.update(state.sets)
+        snapshot = dict()
+        for key in keys:
+            entry = self.__resolve_source(state, key)
+            if entry is not None:
+                snapshot[key] = entry
+        return snapshot
+
+    def __resolve_source(
+        self, state: _State, key: str
+    ) -> Optional[Tuple[Union[List[Any], Text, int, bool, float], int]]:
+        """Resolves `key` the same way `__get` does, but without type checks
+
+        Returns the raw value and the source it was found in, or None if the key
+        needs to go through the regular lookup.
+        """
+        split_keys = key.split(self.__delim_char)
+        for i in range(1, len(split_keys) + 1):
+            joined_key = self.__delim_char.join(split_keys[:i])
+            if joined_key in state.sets:
+                return state.sets[joined_key], _SOURCE_SET
+            if state.use_env:
+                e_key = self.__env_lookup(state, joined_key)
+                if e_key is not None:
+                    return e_key, _SOURCE_ENV
+            if joined_key in state.data:
+                val = state.data[joined_key]
+                if isinstance(val, str) and val in state.refs:
+                    return None
+                return val, _SOURCE_FILE
+            if joined_key in state.defaults:
+                return state.defaults[joined_key], _SOURCE_DEFAULT
+        return None
 
     def __set(self, key: str, value: Union[str, int, float, bool, List[Any]],
               t: Type[Union[str, int, float, bool, List[Any]]]) -> None:
@@ -210,22 +1139,22 @@ class Gestalt:
             raise TypeError(
                 f'Input value when setting {t} of type {type(value)} is not permitted'
             )
-        if key in self.__conf_data and not isinstance(self.__conf_data[key],
-                                                      t):
-            raise TypeError(
-                f'File config has {key} with type {type(self.__conf_data[key])}. \
-                    Setting key with type {t} is not permitted')
-        if key in self.__conf_defaults and not isinstance(
-                self.__conf_defaults[key], t):
-            raise TypeError(
-                f'Default config has {key} with type {type(self.__conf_defaults[key])}. \
-                    Setting key with type {t} is not permitted')
-        if key in self.__conf_sets and not isinstance(self.__conf_sets[key],
-                                                      t):
-            raise TypeError(
-                f'Overriding key {key} with type {type(self.__conf_sets[key])} with a {t} is not permitted'
-            )
-        self.__conf_sets[key] = value
+        with self.__write_lock:
+            state = self.__load_sections(self.__state, key)
+            if key in state.data and not isinstance(state.data[key], t):
+                raise TypeError(
+                    f'File config has {key} with type {type(state.data[key])}. \
+                        Setting key with type {t} is not permitted')
+            if key in state.defaults and not isinstance(
+                    state.defaults[key], t):
+                raise TypeError(
+                    f'Default config has {key} with type {type(state.defaults[key])}. \
+                        Setting key with type {t} is not permitted')
+            if key in state.sets and not isinstance(state.sets[key], t):
+                raise TypeError(
+                    f'Overriding key {key} with type {type(state.sets[key])} with a {t} is not permitted'
+                )
+            self.__state = state.evolve(sets={**state.sets, key: value})
 
     def set_string(self, key: str, value: str) -> None:
         """Sets the override string configuration for a given key
@@ -301,22 +1230,24 @@ class Gestalt:
             raise TypeError(
                 f'Input value when setting default {t} of type {type(value)} is not permitted'
             )
-        if key in self.__conf_data and not isinstance(self.__conf_data[key],
-                                                      t):
-            raise TypeError(
-                f'File config has {key} with type {type(self.__conf_data[key])}. \
-                    Setting default with type {t} is not permitted')
-        if key in self.__conf_sets and not isinstance(self.__conf_sets[key],
-                                                      t):
-            raise TypeError(
-                f'Set config has {key} with type {type(self.__conf_sets[key])}. \
-                    Setting key with type {t} is not permitted')
-        if key in self.__conf_defaults and not isinstance(
-                self.__conf_defaults[key], t):
-            raise TypeError(f'Overriding default key {key} \
-                    with type {type(self.__conf_defaults[key])} with a {t} is not permitted'
-                            )
-        self.__conf_defaults[key] = value
+        with self.__write_lock:
+            state = self.__load_sections(self.__state, key)
+            if key in state.data and not isinstance(state.data[key], t):
+                raise TypeError(
+                    f'File config has {key} with type {type(state.data[key])}. \
+                        Setting default with type {t} is not permitted')
+            if key in state.sets and not isinstance(state.sets[key], t):
+                raise TypeError(
+                    f'Set config has {key} with type {type(state.sets[key])}. \
+                        Setting key with type {t} is not permitted')
+            if key in state.defaults and not isinstance(
+                    state.defaults[key], t):
+                raise TypeError(f'Overriding default key {key} \
+                        with type {type(state.defaults[key])} with a {t} is not permitted'
+                                )
+            self.__state = state.evolve(defaults={
+                **state.defaults, key: value
+            })
 
     def set_default_string(self, key: str, value: str) -> None:
         """Sets the default string configuration for a given key
@@ -383,17 +1314,83 @@ class Gestalt:
         """
         self.__set_default(key, value, list)
 
-    def __get(
-        self, key: str, default: Optional[Union[str, int, float, bool,
-                                                List[Any]]],
-        t: Type[Union[str, int, float, bool, List[Any]]]
-    ) -> Union[str, int, float, bool, List[Any]]:
+    def __get(self,
+              key: str,
+              default: Optional[Union[str, int, float, bool, List[Any]]],
+              t: Type[Union[str, int, float, bool, List[Any]]],
+              measure: bool = True) -> Union[str, int, float, bool, List[Any]]:
+        if measure and self.__metrics is not None and isinstance(key, str):
+            return self.__get_measured(self.__metrics, key, default, t)
         if not isinstance(key, str):
             raise TypeError(f'Given key is not of string type')
         if default and not isinstance(default, t):
             raise TypeError(
                 f'Provided default is of incorrect type {type(default)}, it should be of type {t}'
             )
+        # every read below goes through this reference, so the lookup sees a single
+        # consistent state even if a writer swaps it in the meantime
+        state = self.__state
+        if state.pending:
+            state = self.__load_sections(state, key)
+        if self.__frozen:
+            snapshot = state.snapshot
+            if snapshot is None:
+                snapshot = state.snapshot = self.__compile_snapshot(state)
+            entry = snapshot.get(key)
+            # an explicit default takes precedence over set defaults
+            if entry is not None and not (entry[1] == _SOURCE_DEFAULT
+                                          and default):
+                return self.__check_compiled(state, key, entry, t)
+        cache = state.cache
+        if cache is None or isinstance(default, list):
+            return self.__lookup(state, key, default, t)
+
+        # the cache is shared by concurrent lookups, entries may be evicted by
+        # another thread at any point
+        cache_key = (key, t, default)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            if cached[1] is None or datetime.now() < cached[1]:
+                try:
+                    cache.move_to_end(cache_key)
+                except KeyError:
+                    pass
+                self.__cache_hits += 1
+                return cached[0]
+            # the provider value backing this entry has expired
+            cache.pop(cache_key, None)
+        self.__cache_misses += 1
+        val = self.__lookup(state, key, default, t)
+        cache[cache_key] = (val, self.__provider_expiry(state, key))
+        while len(cache) > self.__cache_max_size:
+            try:
+                cache.popitem(last=False)
+            except KeyError:
+                break
+        return val
+
+    def __get_measured(
+        self, metrics: Metrics, key: str,
+        default: Optional[Union[str, int, float, bool,
+                                List[Any]]], t: Type[Union[str, int, float,
+                                                           bool, List[Any]]]
+    ) -> Union[str, int, float, bool, List[Any]]:
+        """Looks `key` up like `__get`, counting and timing the lookup"""
+        start = time.perf_counter()
+        try:
+            val = self.__get(key, default, t, measure=False)
+        except Exception:
+            metrics.record_read(key, time.perf_counter() - start, failed=True)
+            raise
+        metrics.record_read(key, time.perf_counter() - start, failed=False)
+        return val
+
+    def __lookup(
+        self, state: _State, key: str,
+        default: Optional[Union[str, int, float, bool,
+                                List[Any]]], t: Type[Union[str, int, float,
+                                                           bool, List[Any]]]
+    ) -> Union[str, int, float, bool, List[Any]]:
         split_keys = key.split(self.__delim_char)
         consider_keys = list()
         config_val = None
@@ -403,7 +1400,8 @@ class Gestalt:
             config_val = self._get_config_for_key(key=key,
                                                   key_to_search=joined_key,
                                                   default=default,
-                                                  object_type=t)
+                                                  object_type=t,
+                                                  state=state)
             if config_val is not None and config_val != default:
                 return config_val
         if default is not None:
@@ -413,6 +1411,38 @@ class Gestalt:
             f'Given key {key} is not in any configuration and no default is provided'
         )
 
+    def __provider_expiry(self, state: _State, key: str) -> Optional[datetime]:
+        """Returns when the provider value `key` resolves through expires, if any
+        """
+        split_keys = key.split(self.__delim_char)
+        for i in range(1, len(split_keys) + 1):
+            val = state.data.get(self.__delim_char.join(split_keys[:i]))
+            if not isinstance(val, str):
+                continue
+            ref = state.refs.get(val)
+            if ref is not None:
+                provider = self.providers.get(ref[0])
+                if provider is not None:
+                    return provider.expires_at(val)
+        return None
+
+    def __check_compiled(
+        self, state: _State, key: str, entry: Tuple[Union[List[Any], Text, int,
+                                                          bool, float], int],
+        t: Type[Union[str, int, float, bool, List[Any]]]
+    ) -> Union[str, int, float, bool, List[Any]]:
+        val, source = entry
+        if source == _SOURCE_ENV:
+            return self.__coerce_env(state, str(val), t)
+        if not isinstance(val, t):
+            if source == _SOURCE_DEFAULT:
+                raise TypeError(
+                    f'Given default set key is not of type {t}, but of type {type(val)}'
+                )
+            raise TypeError(
+                f'Given set key is not of type {t}, but of type {type(val)}')
+        return val
+
     def get_string(self, key: str, default: Optional[Text] = None) -> str:
         """Gets the configuration string for a given key
 
@@ -538,61 +1568,471 @@ class Gestalt:
                 f'Gestalt error: expected to return list, but got {type(val)}')
         return val
 
+    def bind(self, schema: type, prefix: str = '') -> Any:
+        """Reads every field of a dataclass, or of a class with `__slots__`, at once
+
+        Each field is read from the key named after it under `prefix`, with the
+        `get_*` method matching its type: `str`, `int`, `float`, `bool`, lists, and
+        dictionaries, which are read with `get_section`. Fields typed as another
+        dataclass are read from the section named after them. Fields missing from the
+        configuration take their dataclass default, or None if they are `Optional`.
+
+        The values are set on a single instance with `__slots__`, so reading them
+        later is plain attribute access. Dataclasses without `__slots__` are bound to
+        a copy of the class that has them, with the same name, fields and methods,
+        which is not a subclass of `schema`, so `isinstance(instance, schema)` only
+        holds for schemas declared with `__slots__` or `@dataclass(slots=True)`.
+        Instances are created without calling `__init__` or `__post_init__`. The
+        instance is updated in place whenever `build_config` or `rebuild_config` load
+        the configuration again. If it cannot be rebound, it keeps its previous values
+        and the error is logged.
+
+        Args:
+            schema (type): The dataclass or slotted class to bind
+            prefix (str): The section the fields are read from, the top level of the
+                configuration by default
+
+        Returns:
+            The bound instance, of `schema` or of its slotted copy
+
+        Raises:
+            TypeError: If `schema` is not a dataclass or slotted class, or has a field
+                of a type that cannot be read from the configuration
+            ValueError: If any field is missing or of the wrong type, listing all of
+                them
+        """
+        errors: List[Tuple[str, str, bool]] = []
+        values = binding.resolve(self, schema, prefix, self.__delim_char,
+                                 errors)
+        if errors:
+            raise ValueError(binding.error_message(schema, errors))
+        cls = binding.slotted(schema)
+        instance = object.__new__(cls)
+        binding.assign(instance, schema, values)
+        ref: Callable[[], Any]
+        try:
+            ref = weakref.ref(instance)
+        except TypeError:
+            # slotted classes without `__weakref__` are kept alive by the binding
+            ref = functools.partial(lambda i: i, instance)
+        with self.__write_lock:
+            self.__bindings.append((ref, schema, prefix))
+        return instance
+
+    def __rebind(self) -> None:
+        """Updates the instances returned by `bind`, must be called with the write lock
+        held
+        """
+        bindings = []
+        for ref, schema, prefix in self.__bindings:
+            instance = ref()
+            if instance is None:
+                continue
+            bindings.append((ref, schema, prefix))
+            errors: List[Tuple[str, str, bool]] = []
+            values = binding.resolve(self, schema, prefix, self.__delim_char,
+                                     errors)
+            if errors:
+                logger.error(binding.error_message(schema, errors))
+                continue
+            binding.assign(instance, schema, values)
+        self.__bindings = bindings
+
+    def get_section(self, prefix: str) -> Dict[str, Any]:
+        """Gets every key nested under `prefix` as a nested dictionary
+
+        Values are resolved the same way the `get_*` methods resolve them, with set
+        values, environment variables, configuration files and set defaults in that
+        order of precedence. Provider references in the section are fetched together
+        up front, so each distinct provider path is read once. When `prefix` itself
+        refers to a provider, the value the provider returns for it is returned.
+
+        The keys of the section are found in a sorted index of all keys, built on the
+        first call after the configuration changes, so the time taken grows with the
+        size of the section rather than the size of the configuration. After a
+        `set_*`, `set_default_*`, `build_config` or `rebuild_config`, the first
+        call pays for a full sort of every key. With metrics enabled, each key of
+        the section is recorded as a read.
+
+        Args:
+            prefix (str): The key of the section, or an empty string for the whole
+                configuration
+
+        Returns:
+            dict: The values under `prefix`, nested by the configuration delimiter
+
+        Raises:
+            TypeError: If the `prefix` is not a string, or is a single value rather
+                than a section
+            ValueError: If no key is nested under `prefix`
+        """
+        if not isinstance(prefix, str):
+            raise TypeError('Given key is not of string type')
+        state = self.__load_sections(self.__state, prefix or None)
+        sep = self.__delim_char
+        ref = self.__provider_ref(state, prefix) if prefix else None
+        metrics = self.__metrics
+        if ref is not None:
+            name, val, path, filter_ = ref
+            start_time = time.perf_counter()
+            try:
+                fetched: Any = self.providers[name].get(key=val,
+                                                        path=path,
+                                                        filter=filter_,
+                                                        sep=sep)
+            except Exception:
+                if metrics is not None:
+                    metrics.record_read(prefix,
+                                        time.perf_counter() - start_time,
+                                        failed=True)
+                raise
+            if metrics is not None:
+                metrics.record_read(prefix,
+                                    time.perf_counter() - start_time,
+                                    failed=False)
+            if not isinstance(fetched, dict):
+                raise TypeError(
+                    f'Given key {prefix} is not a section, but of type {type(fetched)}'
+                )
+            return fetched
+
+        keys = self.__section_keys(state, prefix)
+        if not keys:
+            if prefix in state.data or prefix in state.sets or prefix in state.defaults:
+                raise TypeError(f'Given key {prefix} is not a section')
+            raise ValueError(f'Given key {prefix} is not in any configuration')
+        self.__prefetch_section(state, keys)
+
+        start = len(prefix) + len(sep) if prefix else 0
+        section: Dict[str, Any] = dict()
+        for key in keys:
+            parts = key[start:].split(sep)
+            node: Dict[str, Any] = section
+            for part in parts[:-1]:
+                child = node.get(part)
+                if not isinstance(child, dict):
+                    child = node[part] = dict()
+                node = child
+            if metrics is None:
+                node[parts[-1]] = self.__section_value(state, key)
+            else:
+                node[parts[-1]] = self.__section_value_measured(
+                    metrics, state, key)
+        return section
+
+    def __section_keys(self, state: _State, prefix: str) -> List[str]:
+        """Returns the sorted keys nested under `prefix`"""
+        index = state.index
+        if index is None:
+            index = state.index = sorted(state.data.keys()
+                                         | state.sets.keys()
+                                         | state.defaults.keys())
+        if not prefix:
+            return index
+        # keys starting with `low` sort between it and the string following every
+        # such key
+        low = prefix + self.__delim_char
+        high = low[:-1] + chr(ord(low[-1]) + 1)
+        return index[bisect.bisect_left(index, low):bisect.
+                     bisect_left(index, high)]
+
+    def __prefetch_section(self, state: _State, keys: List[str]) -> None:
+        """Fetches the provider references `keys` resolve through, grouped by
+        provider so that each provider reads every distinct path once
+        """
+        refs: Dict[str, List[Tuple[str, str, Optional[str]]]] = dict()
+        for key in keys:
+            if key not in state.data or not isinstance(state.data[key], str):
+                continue
+            ref = self.__provider_ref(state, key)
+            if ref is not None:
+                name, val, path, filter_ = ref
+                refs.setdefault(name, []).append((val, path, filter_))
+        for name, provider_refs in refs.items():
+            self.providers[name].prefetch(provider_refs, sep=self.__delim_char)
+
+    def __section_value(
+            self, state: _State, key: str
+    ) -> Union[str, int, float, bool, List[Any], Dict[str, Any]]:
+        entry = self.__resolve_source(state, key)
+        if entry is None:
+            ref = self.__provider_ref(state, key)
+            if ref is None:
+                return state.data[key]
+            name, ref_val, path, filter_ = ref
+            return self.providers[name].get(key=ref_val,
+                                            path=path,
+                                            filter=filter_,
+                                            sep=self.__delim_char)
+        val, source = entry
+        if source != _SOURCE_ENV:
+            return val
+        # environment variables are converted to the type of the value they override
+        base = state.data.get(key, state.defaults.get(key))
+        t = type(base) if isinstance(base, (int, float, bool)) else str
+        return self.__coerce_env(state, str(val), t)
+
+    def __section_value_measured(
+            self, metrics: Metrics, state: _State, key: str
+    ) -> Union[str, int, float, bool, List[Any], Dict[str, Any]]:
+        """Reads `key` like `__section_value`, counting and timing the read"""
+        start = time.perf_counter()
+        try:
+            val = self.__section_value(state, key)
+        except Exception:
+            metrics.record_read(key, time.perf_counter() - start, failed=True)
+            raise
+        metrics.record_read(key, time.perf_counter() - start, failed=False)
+        return val
+
+    async def __aget(
+        self, key: str, default: Optional[Union[str, int, float, bool,
+                                                List[Any]]],
+        t: Type[Union[str, int, float, bool, List[Any]]]
+    ) -> Union[str, int, float, bool, List[Any]]:
+        """Looks `key` up like `__get`, fetching provider values without blocking
+
+        Values resolved through an async provider are returned as the provider
+        returns them, so the lookup never reads the provider from the event loop.
+        """
+        if not isinstance(key, str):
+            raise TypeError('Given key is not of string type')
+        if default and not isinstance(default, t):
+            raise TypeError(
+                f'Provided default is of incorrect type {type(default)}, it should be of type {t}'
+            )
+        ref = self.__provider_ref(self.__load_sections(self.__state, key), key)
+        provider = self.async_providers.get(ref[0]) if ref else None
+        if ref is None or provider is None:
+            return self.__get(key, default, t)
+
+        _, val, path, filter_ = ref
+        metrics = self.__metrics
+        start = time.perf_counter()
+        try:
+            fetched = await provider.get(key=val,
+                                         path=path,
+                                         filter=filter_,
+                                         sep=self.__delim_char)
+            if not isinstance(fetched, t):
+                raise TypeError(
+                    f'Given set key is not of type {t}, but of type {type(fetched)}'
+                )
+        except Exception:
+            if metrics is not None:
+                metrics.record_read(key,
+                                    time.perf_counter() - start,
+                                    failed=True)
+            raise
+        if metrics is not None:
+            metrics.record_read(key, time.perf_counter() - start, failed=False)
+        return fetched
+
+    def __provider_ref(
+            self, state: _State,
+            key: str) -> Optional[Tuple[str, str, str, Optional[str]]]:
+        """Returns the provider name, reference, path and filter that looking `key` up
+        reads from, or None if the lookup does not go through a provider
+        """
+        split_keys = key.split(self.__delim_char)
+        for i in range(1, len(split_keys) + 1):
+            joined_key = self.__delim_char.join(split_keys[:i])
+            if joined_key in state.sets:
+                return None
+            if state.use_env and self.__env_lookup(state,
+                                                   joined_key) is not None:
+                return None
+            if joined_key not in state.data:
+                continue
+            val = state.data[joined_key]
+            if not isinstance(val, str):
+                return None
+            ref = state.refs.get(val)
+            if ref is None or ref[0] not in self.providers:
+                return None
+            name, path, filter_ = ref
+            return name, val, path, _ref_filter(filter_, key, joined_key)
+        return None
+
+    async def aget_string(self,
+                          key: str,
+                          default: Optional[Text] = None) -> str:
+        """Gets the configuration string for a given key, without blocking the event loop
+        on provider reads
+
+        Args:
+            key (str): The key to get
+            default (Optional: string): Optional default value if a configuration does not exist
+
+        Returns:
+            string: The string value at the given `key`
+
+        Raises:
+            TypeError: If the `key` is not a string or `value` is not of string type. Raised if the
+                environment variable cannot be coalesced to the needed type.
+            ValueError: If the 'key' is not in any configuration and no default is provided
+            RuntimeError: If the internal value was stored with the incorrect type. This indicates
+                a serious library bug
+        """
+        val = await self.__aget(key, default, str)
+        if not isinstance(val, str):
+            raise RuntimeError(
+                f'Gestalt error: expected to return string, but got {type(val)}'
+            )
+        return val
+
+    async def aget_int(self, key: str, default: Optional[int] = None) -> int:
+        """Gets the configuration int for a given key, without blocking the event loop
+        on provider reads
+
+        Args:
+            key (str): The key to get
+            default (Optional: int): Optional default value if a configuration does not exist
+
+        Returns:
+            int: The int value at the given `key`
+
+        Raises:
+            TypeError: If the `key` is not a string or `value` is not of int type. Raised if the
+                environment variable cannot be coalesced to the needed type.
+            ValueError: If the 'key' is not in any configuration and no default is provided
+            RuntimeError: If the internal value was stored with the incorrect type. This indicates
+                a serious library bug
+        """
+        val = await self.__aget(key, default, int)
+        if not isinstance(val, int):
+            raise RuntimeError(
+                f'Gestalt error: expected to return int, but got {type(val)}')
+        return val
+
+    async def aget_float(self,
+                         key: str,
+                         default: Optional[float] = None) -> float:
+        """Gets the configuration float for a given key, without blocking the event loop
+        on provider reads
+
+        Args:
+            key (str): The key to get
+            default (Optional: float): Optional default value if a configuration does not exist
+
+        Returns:
+            float: The float value at the given `key`
+
+        Raises:
+            TypeError: If the `key` is not a string or `value` is not of float type. Raised if the
+                environment variable cannot be coalesced to the needed type.
+            ValueError: If the 'key' is not in any configuration and no default is provided
+            RuntimeError: If the internal value was stored with the incorrect type. This indicates
+                a serious library bug
+        """
+        val = await self.__aget(key, default, float)
+        if not isinstance(val, float):
+            raise RuntimeError(
+                f'Gestalt error: expected to return float, but got {type(val)}'
+            )
+        return val
+
+    async def aget_bool(self,
+                        key: str,
+                        default: Optional[bool] = None) -> bool:
+        """Gets the configuration bool for a given key, without blocking the event loop
+        on provider reads
+
+        Args:
+            key (str): The key to get
+            default (Optional: bool): Optional default value if a configuration does not exist
+
+        Returns:
+            bool: The bool value at the given `key`
+
+        Raises:
+            TypeError: If the `key` is not a string or `value` is not of bool type. Raised if the
+                environment variable cannot be coalesced to the needed type.
+            ValueError: If the 'key' is not in any configuration and no default is provided
+            RuntimeError: If the internal value was stored with the incorrect type. This indicates
+                a serious library bug
+        """
+        val = await self.__aget(key, default, bool)
+        if not isinstance(val, bool):
+            raise RuntimeError(
+                f'Gestalt error: expected to return bool, but got {type(val)}')
+        return val
+
+    async def aget_list(self,
+                        key: str,
+                        default: Optional[List[Any]] = None) -> List[Any]:
+        """Gets the configuration list for a given key, without blocking the event loop
+        on provider reads
+
+        Args:
+            key (str): The key to get
+            default (Optional: list): Optional default value if a configuration does not exist
+
+        Returns:
+            list: The list value at the given `key`
+
+        Raises:
+            TypeError: If the `key` is not a string or `value` is not of list type. Raised if the
+                environment variable cannot be coalesced to the needed type.
+            ValueError: If the 'key' is not in any configuration and no default is provided
+            RuntimeError: If the internal value was stored with the incorrect type. This indicates
+                a serious library bug
+        """
+        val = await self.__aget(key, default, list)
+        if not isinstance(val, list):
+            raise RuntimeError(
+                f'Gestalt error: expected to return list, but got {type(val)}')
+        return val
+
     def dump(self) -> Text:
         """Formats the current set of configurations as a pretty printed JSON string
 
         Returns:
             str: JSON string representation
         """
-        ret: Dict[str, Any] = self.__conf_defaults
-        ret.update(self.__conf_data)
-        ret.update(self.__conf_sets)
+        state = self.__load_sections(self.__state, None)
+        ret: Dict[str, Any] = dict(state.defaults)
+        ret.update(state.data)
+        ret.update(state.sets)
         return str(json.dumps(ret, indent=4))
 
     def _get_config_for_key(
-        self, key: str, key_to_search: str,
+        self,
+        key: str,
+        key_to_search: str,
         default: Optional[Union[str, int, float, bool, List[Any]]],
-        object_type: Type[Union[str, int, float, bool, List[Any]]]
+        object_type: Type[Union[str, int, float, bool, List[Any]]],
+        state: Optional[_State] = None
     ) -> Optional[Union[str, int, float, bool, List[Any]]]:
-        if key_to_search in self.__conf_sets:
-            val = self.__conf_sets[key_to_search]
+        if state is None:
+            state = self.__state
+        if key_to_search in state.sets:
+            val = state.sets[key_to_search]
             if not isinstance(val, object_type):
                 raise TypeError(
                     f'Given set key is not of type {object_type}, but of type {type(val)}'
                 )
             return val
 
-        if self.__use_env:
-            e_key = key_to_search.upper().replace(self.__delim_char, '_')
-            if e_key in os.environ:
-                try:
-                    return object_type(os.environ[e_key])
-                except ValueError as e:
-                    raise TypeError(
-                        f'The environment variable {e_key} could not be converted to type {object_type}: {e}'
-                    )
-
-        if key_to_search in self.__conf_data:
-            val = self.__conf_data[key_to_search]
-            for provider in self.providers.values():
-                if isinstance(val, str) and val.startswith(provider.scheme):
-                    regex_search = self.regex_pattern.search(val)
-                    if regex_search is not None:
-                        path = regex_search.group(2)
-                        filter_ = regex_search.group(3)
-                        remainder_filter = key[len(key_to_search):]
-                        if len(remainder_filter) > 1:
-                            if filter_ is not None:
-                                filter_ = f".{filter_}{remainder_filter}"
-
-                            else:
-                                filter_ = remainder_filter
-
-                        interpolated_val = provider.get(key=val,
-                                                        path=path,
-                                                        filter=filter_,
-                                                        sep=self.__delim_char)
-                        break
+        if state.use_env:
+            e_key = self.__env_lookup(state, key_to_search)
+            if e_key is not None:
+                return self.__coerce_env(state, e_key, object_type)
+
+        if key_to_search in state.data:
+            val = state.data[key_to_search]
+            # references were parsed when the data was built, so dispatching to the
+            # provider is a dictionary lookup on the provider name
+            ref = state.refs.get(val) if isinstance(val, str) else None
+            provider = self.providers.get(ref[0]) if ref is not None else None
+            if isinstance(val,
+                          str) and ref is not None and provider is not None:
+                interpolated_val = provider.get(key=val,
+                                                path=ref[1],
+                                                filter=_ref_filter(
+                                                    ref[2], key,
+                                                    key_to_search),
+                                                sep=self.__delim_char)
             else:
                 interpolated_val = val
 
@@ -605,8 +2045,8 @@ class Gestalt:
         if default:
             return default
 
-        if key_to_search in self.__conf_defaults:
-            val = self.__conf_defaults[key_to_search]
+        if key_to_search in state.defaults:
+            val = state.defaults[key_to_search]
             if not isinstance(val, object_type):
                 raise TypeError(
                     f'Given default set key is not of type {object_type}, but of type {type(val)}'
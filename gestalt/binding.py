@@ -0,0 +1,214 @@
+import dataclasses
+import functools
+from typing import (Any, Callable, Dict, List, Optional, Tuple, Union,
+                    get_args, get_origin, get_type_hints)
+
+# name of the `Gestalt` method reading each type of field
+_GETTERS = {
+    str: 'get_string',
+    int: 'get_int',
+    float: 'get_float',
+    bool: 'get_bool',
+    list: 'get_list',
+    dict: 'get_section',
+}
+
+
+class _Field:
+    __slots__ = ('name', 'kind', 'type', 'item', 'default', 'optional')
+
+    def __init__(self, name: str, kind: str, type_: Any, item: Optional[type],
+                 default: Optional[Callable[[], Any]], optional: bool) -> None:
+        self.name = name
+        # `value` for types read with a getter, `schema` for nested schemas
+        self.kind = kind
+        self.type = type_
+        # type of the items of a list, when it is checked
+        self.item = item
+        # returns the default value, None when the field is required
+        self.default = default
+        self.optional = optional
+
+
+def _has_slots(cls: type) -> bool:
+    """Whether instances of `cls` have no `__dict__`"""
+    return all('__slots__' in vars(c) for c in cls.__mro__[:-1])
+
+
+def _is_schema(cls: Any) -> bool:
+    return isinstance(cls, type) and (dataclasses.is_dataclass(cls)
+                                      or _has_slots(cls))
+
+
+@functools.lru_cache(maxsize=None)
+def fields(schema: type) -> Tuple[_Field, ...]:
+    """Returns the fields of a dataclass, or of a class with `__slots__` and
+    annotations
+
+    Raises:
+        TypeError: If `schema` is neither, or a field has a type that cannot be read
+            from the configuration
+    """
+    if not _is_schema(schema):
+        raise TypeError(
+            f'{schema} is not a dataclass or a class with __slots__')
+    hints = get_type_hints(schema)
+    defaults: Dict[str, Optional[Callable[[], Any]]] = dict()
+    if dataclasses.is_dataclass(schema):
+        for f in dataclasses.fields(schema):
+            if f.default is not dataclasses.MISSING:
+                defaults[f.name] = functools.partial(lambda v: v, f.default)
+            elif f.default_factory is not dataclasses.MISSING:
+                defaults[f.name] = f.default_factory
+            else:
+                defaults[f.name] = None
+    else:
+        defaults = {name: None for name in hints}
+
+    result = []
+    for name, default in defaults.items():
+        hint = hints[name]
+        optional = False
+        args = get_args(hint)
+        if get_origin(hint) is Union and type(None) in args:
+            rest = [a for a in args if a is not type(None)]
+            if len(rest) == 1:
+                hint, optional = rest[0], True
+        origin = get_origin(hint) or hint
+        if _is_schema(hint):
+            result.append(_Field(name, 'schema', hint, None, default,
+                                 optional))
+            continue
+        if origin not in _GETTERS:
+            raise TypeError(
+                f'Field {name} of {schema.__name__} has type {hint}, which cannot '
+                'be read from the configuration')
+        item = None
+        if origin is list and get_args(hint):
+            item_type = get_args(hint)[0]
+            if item_type in _GETTERS:
+                item = item_type
+        result.append(_Field(name, 'value', origin, item, default, optional))
+    return tuple(result)
+
+
+def _repr(self: Any) -> str:
+    values = ', '.join(f'{f.name}={getattr(self, f.name, None)!r}'
+                       for f in fields(type(self).__gestalt_schema__))
+    return f'{type(self).__qualname__}({values})'
+
+
+def _eq(self: Any, other: Any) -> Any:
+    if type(other) is not type(self):
+        return NotImplemented
+    return all(
+        getattr(self, f.name) == getattr(other, f.name)
+        for f in fields(type(self).__gestalt_schema__))
+
+
+def slotted(schema: Any) -> Any:
+    """Returns `schema` if its instances have `__slots__`, or a copy of it that does
+
+    The copy has the same name, fields, methods, properties and special methods, such
+    as the `__repr__` and `__eq__` generated for dataclasses, but is not a subclass
+    of `schema`.
+    """
+    return _slotted(schema)
+
+
+@functools.lru_cache(maxsize=None)
+def _slotted(schema: type) -> type:
+    if _has_slots(schema):
+        return schema
+    names = tuple(f.name for f in fields(schema))
+    # the defaults of the fields would clash with their slots, and the descriptors of
+    # `__dict__` and `__weakref__` only apply to `schema`
+    namespace: Dict[str, Any] = {
+        k: v
+        for k, v in vars(schema).items()
+        if k not in names + ('__dict__', '__weakref__')
+    }
+    namespace.setdefault('__repr__', _repr)
+    namespace.setdefault('__eq__', _eq)
+    namespace.setdefault('__hash__', None)
+    namespace.update({
+        '__slots__':
+        names + ('__weakref__', ),
+        '__module__':
+        schema.__module__,
+        '__qualname__':
+        schema.__qualname__,
+        '__doc__':
+        schema.__doc__,
+        '__annotations__':
+        getattr(schema, '__annotations__', dict()),
+        '__gestalt_schema__':
+        schema,
+    })
+    return type(schema.__name__, (), namespace)
+
+
+def resolve(config: Any, schema: type, prefix: str, sep: str,
+            errors: List[Tuple[str, str, bool]]) -> Dict[str, Any]:
+    """Reads every field of `schema` from `config`, under `prefix`
+
+    Nested schemas are returned as dictionaries of their values. Every field that
+    cannot be read is added to `errors` as its key, the reason, and whether it is
+    missing rather than invalid, and left out of the values.
+    """
+    values: Dict[str, Any] = dict()
+    for f in fields(schema):
+        key = f'{prefix}{sep}{f.name}' if prefix else f.name
+        if f.kind == 'schema':
+            nested_errors: List[Tuple[str, str, bool]] = []
+            nested = resolve(config, f.type, key, sep, nested_errors)
+            if not nested_errors:
+                values[f.name] = nested
+            elif not nested and all(missing
+                                    for _, _, missing in nested_errors) and (
+                                        f.default is not None or f.optional):
+                values[f.name] = f.default() if f.default else None
+            else:
+                errors.extend(nested_errors)
+            continue
+        try:
+            value = getattr(config, _GETTERS[f.type])(key)
+        except ValueError:
+            if f.default is not None:
+                values[f.name] = f.default()
+            elif f.optional:
+                values[f.name] = None
+            else:
+                errors.append((key, 'not in any configuration', True))
+            continue
+        except (TypeError, RuntimeError) as err:
+            errors.append((key, str(err), False))
+            continue
+        if f.item is not None and not all(
+                isinstance(v, f.item) for v in value):
+            errors.append(
+                (key, f'Given list does not only hold items of type {f.item}',
+                 False))
+            continue
+        values[f.name] = value
+    return values
+
+
+def assign(instance: Any, schema: type, values: Dict[str, Any]) -> None:
+    """Sets the fields of `instance` to `values`, updating nested instances in place
+    """
+    for f in fields(schema):
+        value = values[f.name]
+        if f.kind == 'schema' and isinstance(value, dict):
+            current = getattr(instance, f.name, None)
+            if type(current) is not slotted(f.type):
+                current = object.__new__(slotted(f.type))
+            assign(current, f.type, value)
+            value = current
+        object.__setattr__(instance, f.name, value)
+
+
+def error_message(schema: type, errors: List[Tuple[str, str, bool]]) -> str:
+    lines = ''.join(f'\n  {key}: {reason}' for key, reason, _ in errors)
+    return (f'Gestalt Error: Could not bind {schema.__name__}, '
+            f'{len(errors)} fields are invalid:{lines}')
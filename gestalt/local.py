@@ -0,0 +1,139 @@
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import yaml
+
+from gestalt.provider import Provider
+from gestalt.vault import _find
+
+# marks file content that was not parsed yet
+_UNPARSED = object()
+
+
+class LocalFile(Provider):
+
+    def __init__(self,
+                 root: Optional[str] = None,
+                 scheme: str = "ref+file://") -> None:
+        """Reads secrets from local files, such as Kubernetes secrets mounted as a volume
+
+        References name a file or a directory, relative paths are resolved against
+        `root`. Without a filter, the content of a file is returned without its
+        trailing newline. With a filter, the file is parsed as JSON or YAML and the
+        filter applied to it. A directory is read as a mapping from the names of its
+        files to their contents, so that `ref+file:///run/secrets/db#.password` reads
+        the file `/run/secrets/db/password`.
+
+        Files are only read again when their modification time or size changes.
+
+        Args:
+            root (Optional: str): Directory relative paths are resolved against, the
+                working directory if not provided
+            scheme (str): Scheme of the references read from this provider
+        """
+        self.root = root
+        self._scheme = scheme
+        # path of every file read, with its modification time and size, its content
+        # and its content once parsed
+        self._files: Dict[str, Tuple[Tuple[int, int], str, Any]] = dict()
+
+    def get(self,
+            key: str,
+            path: str,
+            filter: Optional[str],
+            sep: Optional[str] = "."
+            ) -> Union[str, int, float, bool, List[Any]]:
+        """Gets a secret from a local file or directory
+
+        Args:
+            key (str): reference the secret is read for
+            path (str): path to the file or directory
+            filter (str): filter to apply to the secret
+            sep (str): delimiter used for flattening
+        Returns:
+            secret: the content of the file, or the value the filter matches
+
+        Raises:
+            RuntimeError: If the file cannot be read or parsed, or the filter matches
+                nothing
+        """
+        full_path = self._resolve(path)
+        if os.path.isdir(full_path):
+            data: Any = self._read_dir(full_path, filter)
+        else:
+            data = self._read_file(full_path, parse=filter is not None)
+        if filter is None:
+            return data  # type: ignore[no-any-return]
+        match = _find(data, filter)
+        if len(match) == 0:
+            raise RuntimeError(
+                f"Gestalt Error: {filter} matches nothing in {full_path}")
+        return match[0]  # type: ignore[no-any-return]
+
+    @property
+    def scheme(self) -> str:
+        return self._scheme
+
+    def expires_at(self, key: str) -> Optional[datetime]:
+        """Values are not cached past the current lookup, so that files replaced on
+        disk are picked up. Reading a file that did not change only costs a `stat`.
+        """
+        return datetime.now()
+
+    def _resolve(self, path: str) -> str:
+        if self.root is not None and not os.path.isabs(path):
+            return os.path.join(self.root, path)
+        return path
+
+    def _read_dir(self, path: str, filter: Optional[str]) -> Dict[str, str]:
+        """Reads the files of a directory into a mapping of file names to contents
+
+        Only the file a filter starts with is read when there is one, hidden entries,
+        such as the `..data` links of Kubernetes volumes, are skipped.
+        """
+        if filter is not None and filter.startswith("."):
+            name = filter[1:].split(".", 1)[0]
+            if name and os.path.isfile(os.path.join(path, name)):
+                return {name: self._read_file(os.path.join(path, name))}
+        try:
+            names = sorted(os.listdir(path))
+        except OSError as err:
+            raise RuntimeError(
+                f"Gestalt Error: Could not read secrets in {path}: {err}")
+        return {
+            name: self._read_file(os.path.join(path, name))
+            for name in names if not name.startswith(".")
+            and os.path.isfile(os.path.join(path, name))
+        }
+
+    def _read_file(self, path: str, parse: bool = False) -> Any:
+        """Returns the content of a file, parsed if `parse` is set, reading it only
+        if it changed since it was last read
+        """
+        try:
+            st = os.stat(path)
+            signature = (st.st_mtime_ns, st.st_size)
+            entry = self._files.get(path)
+            if entry is None or entry[0] != signature:
+                with open(path) as f:
+                    entry = (signature, f.read().rstrip("\n"), _UNPARSED)
+                self._files[path] = entry
+        except OSError as err:
+            raise RuntimeError(
+                f"Gestalt Error: Could not read secret {path}: {err}")
+        if not parse:
+            return entry[1]
+        if entry[2] is _UNPARSED:
+            try:
+                if path.endswith(".json"):
+                    parsed = json.loads(entry[1])
+                else:
+                    parsed = yaml.safe_load(entry[1])
+            except (ValueError, yaml.YAMLError) as err:
+                raise RuntimeError(
+                    f"Gestalt Error: Could not parse secret {path}: {err}")
+            entry = (entry[0], entry[1], parsed)
+            self._files[path] = entry
+        return entry[2]
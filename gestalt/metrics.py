@@ -0,0 +1,239 @@
+import bisect
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Set
+
+# upper bounds of the latency buckets, in seconds, from in-memory lookups to reads
+# from a remote provider
+LATENCY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 1e-3,
+                   1e-2, 0.1, 1.0, 10.0)
+
+
+class Histogram:
+    """Counts observed values into buckets, and keeps their sum"""
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = tuple(bounds)
+        # one count per bucket, and one for values above the last bound
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the count and sum, and the cumulative count of each bucket"""
+        buckets: Dict[float, int] = dict()
+        total = 0
+        for bound, count in zip(self.bounds + (float('inf'), ), self.counts):
+            total += count
+            buckets[bound] = total
+        return {'count': self.count, 'sum': self.sum, 'buckets': buckets}
+
+
+class Metrics:
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        """Records how configuration keys are read and how providers are called
+
+        Counts the reads of every key with the latency of the lookups, the latency
+        and errors of provider fetches and the hits and misses of caches. Counters
+        kept elsewhere, such as the retries of a provider, are read through
+        collectors when the metrics are exported.
+
+        A single instance is meant to be shared by a `Gestalt` and its providers, and
+        can be exported with `to_dict` or, in the Prometheus text format, with
+        `to_prometheus`.
+
+        Args:
+            buckets (Sequence[float]): Upper bounds of the latency buckets in seconds
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._reads: Dict[str, int] = dict()
+        self._lookups = Histogram(self.buckets)
+        self._lookup_errors = 0
+        self._fetches: Dict[str, Histogram] = dict()
+        self._fetch_errors: Dict[str, int] = dict()
+        self._caches: Dict[str, List[int]] = dict()
+        self._collectors: List[Callable[[], Dict[str, Any]]] = []
+
+    def record_read(self, key: str, seconds: float, failed: bool) -> None:
+        """Records a lookup of `key` that took `seconds`"""
+        with self._lock:
+            self._reads[key] = self._reads.get(key, 0) + 1
+            self._lookups.observe(seconds)
+            if failed:
+                self._lookup_errors += 1
+
+    def record_fetch(self, provider: str, seconds: float,
+                     failed: bool) -> None:
+        """Records a fetch from `provider` that took `seconds`"""
+        with self._lock:
+            histogram = self._fetches.get(provider)
+            if histogram is None:
+                histogram = self._fetches[provider] = Histogram(self.buckets)
+            histogram.observe(seconds)
+            if failed:
+                self._fetch_errors[provider] = self._fetch_errors.get(
+                    provider, 0) + 1
+
+    def record_cache(self, cache: str, hit: bool) -> None:
+        """Records a hit or a miss of `cache`"""
+        with self._lock:
+            counts = self._caches.get(cache)
+            if counts is None:
+                counts = self._caches[cache] = [0, 0]
+            counts[0 if hit else 1] += 1
+
+    def add_collector(self, collector: Callable[[], Dict[str, Any]]) -> None:
+        """Adds a function called on export, returning `providers` and `caches`
+        entries shaped like those of `to_dict`, which are merged into it
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def reads(self) -> Dict[str, int]:
+        """Returns the number of reads of every key read so far"""
+        with self._lock:
+            return dict(self._reads)
+
+    def unused_keys(self, keys: Iterable[str], sep: str = '.') -> List[str]:
+        """Returns the sorted `keys` that were never read
+
+        A key counts as read when a key nested under it was, as happens for keys
+        holding a provider reference.
+        """
+        used: Set[str] = set()
+        for key in self.reads():
+            parts = key.split(sep)
+            for i in range(1, len(parts) + 1):
+                used.add(sep.join(parts[:i]))
+        return sorted(k for k in keys if k not in used)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns every metric as plain dictionaries
+
+        Returns:
+            dict: `reads` maps keys to their number of reads, `lookups` holds the
+                lookup latency histogram and the number of failed lookups,
+                `providers` holds the fetch latency histogram, the number of errors
+                and any collected counters per provider, and `caches` the hits,
+                misses and hit ratio per cache
+        """
+        with self._lock:
+            snapshot: Dict[str, Any] = {
+                'reads': dict(self._reads),
+                'lookups': {
+                    **self._lookups.to_dict(), 'errors': self._lookup_errors
+                },
+                'providers': {
+                    provider: {
+                        'fetches': histogram.to_dict(),
+                        'errors': self._fetch_errors.get(provider, 0),
+                    }
+                    for provider, histogram in self._fetches.items()
+                },
+                'caches': {
+                    cache: {
+                        'hits': hits,
+                        'misses': misses
+                    }
+                    for cache, (hits, misses) in self._caches.items()
+                },
+            }
+            collectors = list(self._collectors)
+        for collector in collectors:
+            collected = collector()
+            for section in ('providers', 'caches'):
+                for name, values in collected.get(section, dict()).items():
+                    snapshot[section].setdefault(name, dict()).update(values)
+        for counts in snapshot['caches'].values():
+            total = counts.get('hits', 0) + counts.get('misses', 0)
+            counts['hit_ratio'] = counts.get('hits',
+                                             0) / total if total else 0.0
+        return snapshot
+
+    def to_prometheus(self, namespace: str = 'gestalt') -> str:
+        """Returns every metric in the Prometheus text exposition format"""
+        snapshot = self.to_dict()
+        lines: List[str] = []
+
+        def header(name: str, kind: str, help_: str) -> str:
+            lines.append(f'# HELP {namespace}_{name} {help_}')
+            lines.append(f'# TYPE {namespace}_{name} {kind}')
+            return f'{namespace}_{name}'
+
+        def sample(name: str, labels: Dict[str, str], value: float) -> None:
+            lines.append(f'{name}{_labels(labels)} {_number(value)}')
+
+        def histogram(name: str, labels: Dict[str, str],
+                      values: Dict[str, Any]) -> None:
+            for bound, count in values['buckets'].items():
+                sample(f'{name}_bucket', {
+                    **labels, 'le': _number(bound)
+                }, count)
+            sample(f'{name}_sum', labels, values['sum'])
+            sample(f'{name}_count', labels, values['count'])
+
+        name = header('reads_total', 'counter', 'Number of reads of each key')
+        for key, count in sorted(snapshot['reads'].items()):
+            sample(name, {'key': key}, count)
+
+        name = header('lookup_seconds', 'histogram',
+                      'Time taken by key lookups')
+        histogram(name, dict(), snapshot['lookups'])
+        name = header('lookup_errors_total', 'counter',
+                      'Number of key lookups that failed')
+        sample(name, dict(), snapshot['lookups']['errors'])
+
+        providers = sorted(snapshot['providers'].items())
+        name = header('provider_fetch_seconds', 'histogram',
+                      'Time taken by provider fetches, including retries')
+        for provider, values in providers:
+            if 'fetches' in values:
+                histogram(name, {'provider': provider}, values['fetches'])
+        counters = sorted({
+            counter
+            for _, values in providers
+            for counter, value in values.items()
+            if counter != 'fetches' and isinstance(value, (int, float))
+        })
+        for counter in counters:
+            name = header(f'provider_{counter}_total', 'counter',
+                          f'Number of provider {counter}')
+            for provider, values in providers:
+                if counter in values:
+                    sample(name, {'provider': provider}, values[counter])
+
+        caches = sorted(snapshot['caches'].items())
+        for counter, kind, help_ in (
+            ('hits_total', 'counter', 'Number of cache hits'),
+            ('misses_total', 'counter', 'Number of cache misses'),
+            ('hit_ratio', 'gauge', 'Share of lookups served from cache'),
+        ):
+            name = header(f'cache_{counter}', kind, help_)
+            field = counter[:-len('_total')] if kind == 'counter' else counter
+            for cache, values in caches:
+                sample(name, {'cache': cache}, values.get(field, 0))
+        return '\n'.join(lines) + '\n'
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    escaped = (f'{k}="{_escape(v)}"' for k, v in labels.items())
+    return '{' + ','.join(escaped) + '}'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(value)
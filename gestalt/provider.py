@@ -1,5 +1,8 @@
 from abc import ABCMeta, abstractmethod
-from typing import Tuple, Dict, Any, Optional, Union, List
+from datetime import datetime
+from typing import Tuple, Dict, Any, Optional, Union, List, Iterable
+
+from gestalt.metrics import Metrics
 
 
 class Provider(metaclass=ABCMeta):
@@ -16,7 +19,7 @@ class Provider(metaclass=ABCMeta):
         pass
 
     @abstractmethod
-    def get(self, key: str, path: str, filter: str,
+    def get(self, key: str, path: str, filter: Optional[str],
             sep: Optional[str]) -> Union[str, int, float, bool, List[Any]]:
         """Abstract method to get a value from the provider
         """
@@ -28,3 +31,63 @@ class Provider(metaclass=ABCMeta):
         """Returns scheme of provider
         """
         pass
+
+    def expires_at(self, key: str) -> Optional[datetime]:
+        """Returns when the value cached for `key` expires
+
+        Providers with values that do not expire do not need to override this.
+        """
+        return None
+
+    def prefetch(self,
+                 refs: Iterable[Tuple[str, str, Optional[str]]],
+                 sep: Optional[str] = ".",
+                 max_workers: Optional[int] = None) -> None:
+        """Fetches values ahead of time so that later calls to `get` are served from cache
+
+        The default implementation calls `get` for every reference one after the other.
+        Providers that can fetch values in bulk or concurrently should override this.
+
+        Args:
+            refs (Iterable): The key, path and filter of each reference, as they would
+                be passed to `get`
+            sep (str): delimiter used for flattening
+            max_workers (Optional: int): Maximum number of concurrent fetches
+        """
+        for key, path, filter in refs:
+            self.get(key=key, path=path, filter=filter, sep=sep)
+
+    def enable_metrics(self, metrics: Metrics) -> None:
+        """Records fetches and cache lookups of the provider into `metrics`
+
+        Providers that do not record metrics do not need to override this.
+        """
+        pass
+
+
+class AsyncProvider(metaclass=ABCMeta):
+    """Abstract provider class for providers fetching values with asyncio
+    """
+
+    @abstractmethod
+    async def get(
+            self, key: str, path: str, filter: Optional[str],
+            sep: Optional[str]) -> Union[str, int, float, bool, List[Any]]:
+        """Abstract method to get a value from the provider without blocking the event
+        loop
+        """
+        pass
+
+    @property
+    @abstractmethod
+    def scheme(self) -> str:
+        """Returns scheme of provider
+        """
+        pass
+
+    def expires_at(self, key: str) -> Optional[datetime]:
+        """Returns when the value cached for `key` expires
+
+        Providers with values that do not expire do not need to override this.
+        """
+        return None
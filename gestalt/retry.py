@@ -0,0 +1,176 @@
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple, Type, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling when too many calls failed in a row"""
+
+
+class RetryPolicy:
+
+    def __init__(
+        self,
+        tries: int = 5,
+        base_delay: float = 0.5,
+        max_delay: float = 10.0,
+        multiplier: float = 2.0,
+        jitter: float = 1.0,
+        deadline: Optional[float] = 30.0,
+        failure_threshold: Optional[int] = 5,
+        reset_timeout: float = 30.0,
+        exceptions: Tuple[Type[BaseException], ...] = (Exception, )
+    ) -> None:
+        """Retries failing calls with exponential backoff, within a deadline
+
+        The delay before retry `n` is `base_delay * multiplier ** n`, capped at
+        `max_delay`, and reduced by a random fraction of up to `jitter` so that
+        clients failing together do not retry together. A call gives up once it has
+        been tried `tries` times, or when the next retry would start after `deadline`
+        seconds.
+
+        Calls that still fail after retrying with one of `exceptions` count towards a
+        circuit breaker, other exceptions are raised without retrying. After
+        `failure_threshold` of them in a row, the circuit opens and calls fail with
+        `CircuitOpenError` without being tried, until `reset_timeout` seconds have
+        passed. A single trial call is then let through, which closes the circuit if
+        it succeeds and opens it again otherwise.
+
+        Args:
+            tries (int): Maximum number of attempts per call
+            base_delay (float): Seconds to wait before the first retry
+            max_delay (float): Maximum number of seconds to wait between attempts
+            multiplier (float): Factor the delay grows by after every retry
+            jitter (float): Maximum fraction of the delay removed at random
+            deadline (Optional: float): Maximum number of seconds a call can take,
+                including retries, or None for no limit
+            failure_threshold (Optional: int): Number of failed calls in a row after
+                which the circuit opens, or None to never open it
+            reset_timeout (float): Seconds the circuit stays open
+            exceptions (Tuple): Exception types that are retried, others are raised
+                straight away
+
+        Raises:
+            ValueError: If `tries` is lower than 1 or `jitter` is not between 0 and 1
+        """
+        if tries < 1:
+            raise ValueError(f'tries must be at least 1, not {tries}')
+        if not 0 <= jitter <= 1:
+            raise ValueError(f'jitter must be between 0 and 1, not {jitter}')
+        self.tries = tries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.deadline = deadline
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.exceptions = exceptions
+
+        self._lock = threading.Lock()
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+        self._calls = 0
+        self._retries = 0
+        self._failures = 0
+        self._rejected = 0
+
+    def delay(self, retry: int) -> float:
+        """Returns the number of seconds to wait before retry number `retry`, from 0
+        """
+        delay = min(self.max_delay, self.base_delay * self.multiplier**retry)
+        return delay * (1 - self.jitter * random.random())
+
+    def call(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Calls `fn` with `args` and `kwargs`, retrying it when it fails
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+            Exception: The last exception raised by `fn`, once it cannot be retried
+        """
+        trial = self._before_call()
+        start = time.monotonic()
+        retry = 0
+        while True:
+            try:
+                result = fn(*args, **kwargs)
+            except self.exceptions as err:
+                delay = self.delay(retry)
+                out_of_time = (self.deadline is not None
+                               and time.monotonic() + delay - start
+                               > self.deadline)
+                if retry + 1 >= self.tries or out_of_time:
+                    self._after_call(trial, healthy=False)
+                    raise
+                logger.warning(f'{err}, retrying in {delay:.2f} seconds')
+                with self._lock:
+                    self._retries += 1
+                retry += 1
+                time.sleep(delay)
+            except BaseException:
+                # not a failure of the service being called, it did answer
+                self._after_call(trial, healthy=True)
+                raise
+            else:
+                self._after_call(trial, healthy=True)
+                return result
+
+    def _before_call(self) -> bool:
+        """Counts the call and checks the circuit, returns whether it is a trial call
+        """
+        with self._lock:
+            self._calls += 1
+            if self._opened_at is None:
+                return False
+            if (time.monotonic() - self._opened_at < self.reset_timeout
+                    or self._trial_running):
+                self._rejected += 1
+                raise CircuitOpenError(
+                    'Gestalt Error: Too many failed calls, not trying again for '
+                    f'{self.reset_timeout} seconds')
+            self._trial_running = True
+            return True
+
+    def _after_call(self, trial: bool, healthy: bool) -> None:
+        with self._lock:
+            if trial:
+                self._trial_running = False
+            if healthy:
+                self._consecutive_failures = 0
+                self._opened_at = None
+                return
+            self._failures += 1
+            self._consecutive_failures += 1
+            if trial or (self.failure_threshold is not None and
+                         self._consecutive_failures >= self.failure_threshold):
+                if self._opened_at is None or trial:
+                    logger.warning(
+                        f'{self._consecutive_failures} calls failed in a row, '
+                        f'failing fast for {self.reset_timeout} seconds')
+                self._opened_at = time.monotonic()
+
+    @property
+    def is_open(self) -> bool:
+        """Whether calls currently fail without being tried"""
+        with self._lock:
+            return (self._opened_at is not None and
+                    time.monotonic() - self._opened_at < self.reset_timeout)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the number of calls, retries, calls that failed after retrying and
+        calls rejected by the open circuit
+        """
+        with self._lock:
+            return {
+                'calls': self._calls,
+                'retries': self._retries,
+                'failures': self._failures,
+                'rejected': self._rejected,
+            }
@@ -1,5 +1,14 @@
-from typing import MutableMapping, Text, Any, Union, Dict, List
+from typing import (MutableMapping, Text, Any, Union, Dict, List, Iterable,
+                    Iterator, Mapping, Set, Tuple, Callable, Generic, Hashable,
+                    Optional, TypeVar)
 import collections.abc as collections
+import threading
+
+T = TypeVar('T')
+
+# types YAML and JSON parse into that are never mappings, checked before the slower
+# `MutableMapping` instance check
+_SCALAR_TYPES = frozenset((str, int, float, bool, list, type(None)))
 
 
 def flatten(
@@ -15,3 +24,105 @@ def flatten(
         else:
             items.append((new_key, v))
     return dict(items)
+
+
+def merge_flatten(
+        layers: Iterable[Mapping[Text, Any]],
+        sep: str = '.'
+) -> Dict[Text, Union[List[Any], Text, int, bool, float]]:
+    """Merges `layers` in order and flattens the result in a single pass
+
+    Produces the same entries as merging every layer into an empty dictionary with
+    `merge_into` and calling `flatten` on the result, but writes straight into the
+    flattened dictionary and walks nested mappings with an explicit stack, so deeply
+    nested layers cannot hit the recursion limit. A mapping replacing a plain value
+    replaces it, where `merge_into` would fail.
+    """
+    flat: Dict[Text, Any] = dict()
+    # flattened keys of the nested mappings merged so far
+    branches: Set[Text] = set()
+    for layer in layers:
+        # each frame holds the key prefix of a mapping and its remaining items
+        stack: List[Tuple[Text,
+                          Iterator[Tuple[Text,
+                                         Any]]]] = [('', iter(layer.items()))]
+        while stack:
+            prefix, items = stack[-1]
+            for k, v in items:
+                new_key = prefix + k
+                t = type(v)
+                if t is dict or (t not in _SCALAR_TYPES and isinstance(
+                        v, collections.MutableMapping)):
+                    if v and new_key in flat:
+                        del flat[new_key]
+                    branches.add(new_key)
+                    stack.append((new_key + sep, iter(v.items())))
+                    break
+                if branches and new_key in branches:
+                    _drop_branch(flat, branches, new_key, sep)
+                flat[new_key] = v
+            else:
+                stack.pop()
+    return flat
+
+
+def _drop_branch(flat: Dict[Text, Any], branches: Set[Text], key: Text,
+                 sep: str) -> None:
+    """Removes every flattened entry nested under `key`"""
+    prefix = key + sep
+    for k in [k for k in flat if k.startswith(prefix)]:
+        del flat[k]
+    branches.difference_update(
+        [b for b in branches if b == key or b.startswith(prefix)])
+
+
+class _Call(Generic[T]):
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Optional[T] = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight(Generic[T]):
+    """Runs at most one call per key at a time
+
+    Callers arriving while a call for the same key is running wait for it and get
+    its result, or its exception, instead of making the call again.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call[T]] = dict()
+        # calls that ran, and calls that waited on another one instead
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result  # type: ignore[return-value]
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as err:
+            call.error = err
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
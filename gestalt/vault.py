@@ -1,22 +1,80 @@
+import asyncio
+import functools
 import logging
 import os
+import re
+import socket
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from queue import Queue
-from typing import Any, Dict, List, Optional, Tuple, Union
+from queue import Empty, Queue
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
 
 import hvac  # type: ignore
 import requests
 from jsonpath_ng import parse  # type: ignore
+from requests.adapters import HTTPAdapter
 from requests.exceptions import Timeout
-from retry.api import retry_call
+from urllib3.connection import HTTPConnection
 
-from gestalt.provider import Provider
+from gestalt.metrics import Metrics
+from gestalt.provider import AsyncProvider, Provider
+from gestalt.retry import CircuitOpenError, RetryPolicy
+from gestalt.utils import SingleFlight
 from dateutil.parser import isoparse
 
 EXPIRATION_THRESHOLD_HOURS = 1
+# errors that may go away when a request to vault is retried
+RETRY_EXCEPTIONS = (RuntimeError, Timeout, requests.exceptions.ConnectionError,
+                    hvac.exceptions.InternalServerError,
+                    hvac.exceptions.BadGateway, hvac.exceptions.VaultDown,
+                    hvac.exceptions.RateLimitExceeded)
+FILTER_CACHE_SIZE = 1024
+# the refresher never checks more often than this, in seconds
+MIN_REFRESH_INTERVAL = 1.0
 
 logger = logging.getLogger(__name__)
 
+# filters made only of plain field names, such as `.db.password`
+_SIMPLE_FILTER = re.compile(r"(\.[A-Za-z_][A-Za-z0-9_-]*)+")
+
+
+class _KeepAliveAdapter(HTTPAdapter):
+    """Pools connections with TCP keep-alive enabled, so idle pooled connections are
+    not silently dropped by load balancers between reads
+    """
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        kwargs.setdefault(
+            "socket_options", HTTPConnection.default_socket_options +
+            [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)])
+        super().init_poolmanager(*args, **kwargs)
+
+
+@functools.lru_cache(maxsize=FILTER_CACHE_SIZE)
+def _compile_filter(filter: str) -> Any:
+    """Parses `filter` into a JSONPath expression, parsing is slow so it is cached"""
+    return parse(f"${filter}")
+
+
+def _find(data: Any, filter: str) -> List[Any]:
+    """Returns the values `filter` matches in `data`
+
+    Filters made only of field names are resolved by walking the dictionaries
+    directly. Anything else, including a simple filter that does not match, goes
+    through JSONPath so the results are the same either way.
+    """
+    if _SIMPLE_FILTER.fullmatch(filter):
+        value = data
+        for field in filter[1:].split("."):
+            if not isinstance(value, dict) or field not in value:
+                break
+            value = value[field]
+        else:
+            return [value]
+    return [match.value for match in _compile_filter(filter).find(data)]
+
 
 class Vault(Provider):
 
@@ -31,6 +89,15 @@ class Vault(Provider):
         scheme: str = "ref+vault://",
         delay: int = 60,
         tries: int = 5,
+        refresh_fraction: float = 0.75,
+        refresh_interval: float = 60.0,
+        stale_while_revalidate: float = 0.0,
+        max_staleness: Optional[float] = None,
+        timeout: Union[float, Tuple[float, float]] = 30,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        keep_alive: bool = True,
+        retry_policy: Optional[RetryPolicy] = None,
     ) -> None:
         """Initialized vault client and authenticates vault
 
@@ -40,16 +107,66 @@ class Vault(Provider):
                 These will be picked by default if not set to empty string
             auth_config (HVAC_ClientAuthentication): authenticates the initialized vault client
                 with role and jwt string from kubernetes
+            refresh_fraction (float): Fraction of the lifetime of a lease or TTL secret
+                after which the refresher started with `start` renews or reads it again
+            refresh_interval (float): Maximum number of seconds between two runs of the
+                refresher
+            stale_while_revalidate (float): Number of seconds after a secret expires
+                during which lookups still return it immediately, while it is read
+                again in the background
+            max_staleness (Optional: float): Number of seconds after a secret expires
+                during which it is returned if reading it again fails, instead of
+                raising. Defaults to `stale_while_revalidate`
+            timeout (float): Seconds to wait for vault on each request, or a tuple of
+                the seconds to wait to connect and to wait for a response
+            pool_connections (int): Number of hosts to keep connection pools for
+            pool_maxsize (int): Maximum number of connections kept open to a host, the
+                number of threads that can read from vault at once without opening new
+                connections
+            keep_alive (bool): Enable TCP keep-alive on pooled connections
+            retry_policy (Optional: RetryPolicy): How requests to vault are retried,
+                by default timeouts, connection errors and server errors are retried
+                `tries` times, with exponential backoff capped at `delay` seconds
+
+        Raises:
+            ValueError: If `refresh_fraction` is not between 0 and 1, or if
+                `max_staleness` is shorter than `stale_while_revalidate`
         """
-        self._scheme: str = scheme
         self._run_worker = True
+        self._worker: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+        if not 0 < refresh_fraction <= 1:
+            raise ValueError(
+                f"refresh_fraction must be between 0 and 1, not {refresh_fraction}"
+            )
+        if max_staleness is None:
+            max_staleness = stale_while_revalidate
+        if max_staleness < stale_while_revalidate:
+            raise ValueError(
+                f"max_staleness of {max_staleness} is shorter than "
+                f"stale_while_revalidate of {stale_while_revalidate}")
+        self._scheme: str = scheme
         self.dynamic_token_queue: Queue[Tuple[str, str, str]] = Queue()
         self.kubes_token: Optional[Tuple[str, str, str, datetime]] = None
 
         self._vault_client: Optional[hvac.Client] = None
-        self._secret_expiry_times: Dict[str, datetime] = dict()
-        self._secret_values: Dict[str, Union[str, int, float, bool,
-                                             List[Any]]] = dict()
+        # a secret, its expiry time and the filter and path it was extracted with are
+        # stored together, so that concurrent readers never see one without the others
+        self._secrets: Dict[str, Tuple[Union[str, int, float, bool,
+                                             List[Any]], Optional[datetime],
+                                       Optional[str], str]] = dict()
+        # the data read from each path, its expiry time and when the refresher should
+        # read it again, filters are applied to it locally so that a path is read
+        # once however many keys refer to it
+        self._responses: Dict[str, Tuple[Any, Optional[datetime],
+                                         Optional[datetime]]] = dict()
+        # when the refresher should renew each lease, and the path it was read from
+        self._leases: Dict[str, datetime] = dict()
+        self._lease_paths: Dict[str, str] = dict()
+        # concurrent reads of a path wait for the one already in flight
+        self._flight: SingleFlight[Tuple[Any,
+                                         Optional[datetime]]] = SingleFlight()
+        self._lock = threading.RLock()
         self._is_connected: bool = False
         self._role: Optional[str] = role
         self._jwt: Optional[str] = jwt
@@ -57,27 +174,78 @@ class Vault(Provider):
         self._token: Optional[str] = token
         self._cert: Optional[Tuple[str, str]] = cert
         self._verify: Optional[bool] = verify
+        self._timeout = timeout
+        self._pool_connections = pool_connections
+        self._pool_maxsize = pool_maxsize
+        self._keep_alive = keep_alive
 
         self.delay = delay
         self.tries = tries
+        if retry_policy is None:
+            retry_policy = RetryPolicy(tries=tries,
+                                       max_delay=delay,
+                                       exceptions=RETRY_EXCEPTIONS)
+        self.retry_policy = retry_policy
+        self.refresh_fraction = refresh_fraction
+        self.refresh_interval = refresh_interval
+        self.stale_while_revalidate = stale_while_revalidate
+        self.max_staleness = max_staleness
+        # paths being read again in the background while their stale data is served
+        self._revalidating: Set[str] = set()
+        self._metrics: Optional[Metrics] = None
 
     @property
     def vault_client(self) -> hvac.Client:
         if self._vault_client is None:
-            self._vault_client = hvac.Client(url=self._url,
-                                             token=self._token,
-                                             cert=self._cert,
-                                             verify=self._verify)
+            with self._lock:
+                if self._vault_client is None:
+                    self._vault_client = hvac.Client(url=self._url,
+                                                     token=self._token,
+                                                     cert=self._cert,
+                                                     verify=self._verify,
+                                                     timeout=self._timeout,
+                                                     session=self._session())
         return self._vault_client
 
+    def _session(self) -> requests.Session:
+        """Creates the HTTP session shared by every thread reading from vault
+
+        Connections are pooled and reused across requests, so reads after the first
+        one do not pay for TCP and TLS setup.
+        """
+        adapter_class = _KeepAliveAdapter if self._keep_alive else HTTPAdapter
+        adapter = adapter_class(pool_connections=self._pool_connections,
+                                pool_maxsize=self._pool_maxsize)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    @property
+    def _secret_values(
+            self) -> Dict[str, Union[str, int, float, bool, List[Any]]]:
+        return {key: entry[0] for key, entry in self._secrets.items()}
+
+    @property
+    def _secret_expiry_times(self) -> Dict[str, datetime]:
+        return {
+            key: entry[1]
+            for key, entry in self._secrets.items() if entry[1] is not None
+        }
+
     def connect(self) -> None:
+        with self._lock:
+            self._connect()
+
+    def _ensure_connected(self) -> None:
+        if not self._is_connected:
+            with self._lock:
+                if not self._is_connected:
+                    self._connect()
+
+    def _connect(self) -> None:
         try:
-            retry_call(
-                self.vault_client.is_authenticated,
-                exceptions=(RuntimeError, Timeout),
-                delay=self.delay,
-                tries=self.tries,
-            )
+            self.retry_policy.call(self.vault_client.is_authenticated)
         except requests.exceptions.MissingSchema:
             raise RuntimeError(
                 "Gestalt Error: Unable to connect to vault with the given configuration"
@@ -88,12 +256,8 @@ class Vault(Provider):
                 hvac.api.auth_methods.Kubernetes(
                     self.vault_client.adapter).login(role=self._role,
                                                      jwt=self._jwt)
-                token = retry_call(
-                    self.vault_client.auth.token.lookup_self,
-                    exceptions=(RuntimeError, Timeout),
-                    delay=self.delay,
-                    tries=self.tries,
-                )
+                token = self.retry_policy.call(
+                    self.vault_client.auth.token.lookup_self)
 
                 if token is not None:
                     logger.info("Kubernetes login successful")
@@ -112,16 +276,132 @@ class Vault(Provider):
 
         self._is_connected = True
 
+    def start(self) -> None:
+        """Starts refreshing secrets in a background thread
+
+        Once `refresh_fraction` of their lifetime has passed, the leases of dynamic
+        secrets are renewed and TTL secrets are read again, and the Kubernetes token
+        is renewed before it gets within `EXPIRATION_THRESHOLD_HOURS` of expiring.
+        Lookups are then served from cache instead of waiting on vault when a secret
+        expires. Secrets that cannot be renewed or read are logged and read again on
+        their next lookup.
+
+        Raises:
+            RuntimeError: If the refresher is already running
+        """
+        if self._worker is not None:
+            raise RuntimeError(
+                "Gestalt Error: Vault refresher is already running")
+        self._run_worker = True
+        self._worker = threading.Thread(target=self._refresh_loop,
+                                        name="gestalt-vault-refresher",
+                                        daemon=True)
+        self._worker.start()
+
     def stop(self) -> None:
+        """Stops the background refresher, if running, and waits for it to exit"""
         self._run_worker = False
+        self._wake.set()
+        worker = self._worker
+        if worker is not None and worker is not threading.current_thread():
+            worker.join()
+        self._worker = None
 
     def __del__(self) -> None:
         self.stop()
 
+    def _refresh_loop(self) -> None:
+        while self._run_worker:
+            self._wake.clear()
+            delay = self.refresh_interval
+            try:
+                self._refresh()
+                delay = self._next_refresh_delay()
+            except Exception:
+                logger.exception(
+                    "Gestalt Error: Failed to refresh vault secrets")
+            self._wake.wait(delay)
+
+    def _refresh(self) -> None:
+        """Renews the leases and reads again the TTL secrets that are due"""
+        now = datetime.now()
+        while True:
+            try:
+                lease = self.dynamic_token_queue.get_nowait()
+            except Empty:
+                break
+            _, lease_id, lease_duration = lease
+            self._leases[lease_id] = self._refresh_time(
+                now, now + timedelta(seconds=int(lease_duration)))
+
+        if self.kubes_token is not None:
+            self._validate_token_expiration()
+
+        for lease_id, renew_at in list(self._leases.items()):
+            if now >= renew_at:
+                self._renew_lease(lease_id)
+        for path, (_, _, refresh_at) in list(self._responses.items()):
+            if refresh_at is not None and now >= refresh_at:
+                self._refresh_path(path)
+
+    def _next_refresh_delay(self) -> float:
+        """Returns the number of seconds until the next lease or secret is due"""
+        due = list(self._leases.values())
+        # lookups insert responses concurrently, so iterate over a copy
+        due.extend(entry[2] for entry in list(self._responses.values())
+                   if entry[2] is not None)
+        delay = self.refresh_interval
+        if due:
+            delay = min(delay, (min(due) - datetime.now()).total_seconds())
+        return max(delay, MIN_REFRESH_INTERVAL)
+
+    def _refresh_time(self, start: datetime, expiry: datetime) -> datetime:
+        return start + (expiry - start) * self.refresh_fraction
+
+    def _renew_lease(self, lease_id: str) -> None:
+        path = self._lease_paths.get(lease_id)
+        try:
+            response = self.vault_client.sys.renew_lease(lease_id=lease_id)
+            lease_duration = response["lease_duration"]
+        except Exception as err:
+            lease_duration = 0
+            logger.warning(f"Could not renew lease {lease_id}: {err}")
+        if not lease_duration:
+            # the lease reached its maximum TTL or was revoked, reading the secret
+            # again issues a new one
+            self._leases.pop(lease_id, None)
+            self._lease_paths.pop(lease_id, None)
+            if path is not None:
+                self._refresh_path(path)
+            return
+
+        now = datetime.now()
+        expiry = now + timedelta(seconds=lease_duration)
+        self._leases[lease_id] = self._refresh_time(now, expiry)
+        cached = self._responses.get(path) if path is not None else None
+        if path is not None and cached is not None:
+            self._responses[path] = (cached[0], expiry, cached[2])
+            for key, entry in list(self._secrets.items()):
+                if entry[3] == path:
+                    self._secrets[key] = (entry[0], expiry, entry[2], path)
+
+    def _refresh_path(self, path: str) -> None:
+        """Reads `path` again and updates the secrets extracted from it"""
+        try:
+            requested_data, expiry = self._flight.do(
+                path, lambda: self._read_path(path))
+            for key, entry in list(self._secrets.items()):
+                if entry[3] == path and entry[2] is not None:
+                    self._extract(key, requested_data, entry[2], expiry, path)
+        except Exception as err:
+            # dropped so that the next lookup reads it again
+            self._responses.pop(path, None)
+            logger.warning(f"Could not refresh secret {path}: {err}")
+
     def get(self,
             key: str,
             path: str,
-            filter: str,
+            filter: Optional[str],
             sep: Optional[str] = "."
             ) -> Union[str, int, float, bool, List[Any]]:
         """Gets secret from vault
@@ -133,28 +413,183 @@ class Vault(Provider):
         Returns:
             secret (str): secret
         """
-        if not self._is_connected:
-            self.connect()
-        # if the key has been read before and is not a TTL secret
-        if key in self._secret_values and key not in self._secret_expiry_times:
-            return self._secret_values[key]
+        self._ensure_connected()
+        entry = self._cached(key, filter)
+        metrics = self._metrics
+        if metrics is not None:
+            metrics.record_cache(self.name, hit=entry is not None)
+        if entry is not None:
+            return entry[0]
+
+        requested_data, expiry = self._fetch(path)
+        if filter is None:
+            return requested_data  # type: ignore[no-any-return]
+        return self._extract(key, requested_data, filter, expiry, path)
+
+    def prefetch(self,
+                 refs: Iterable[Tuple[str, str, Optional[str]]],
+                 sep: Optional[str] = ".",
+                 max_workers: Optional[int] = None) -> None:
+        """Reads secrets from vault ahead of time and caches them
 
-        # if the secret can expire but hasn't expired yet
-        if key in self._secret_expiry_times and not self._is_secret_expired(
-                key):
-            return self._secret_values[key]
+        References are grouped by path, so every distinct path is read exactly once,
+        however many keys and filters refer to it. Paths are read concurrently.
+        References that are already cached and not expired are skipped.
+
+        Args:
+            refs (Iterable): The key, path and filter of each reference, as they would
+                be passed to `get`
+            sep (str): delimiter used for flattening
+            max_workers (Optional: int): Maximum number of paths to read at once, the
+                default of the executor is used if not provided
+
+        Raises:
+            RuntimeError: If a secret cannot be read
+        """
+        by_path: Dict[str, List[Tuple[str, str]]] = dict()
+        for key, path, filter in refs:
+            # like `get`, only filtered secrets are cached
+            if filter is None:
+                continue
+            if self._cached(key, filter) is not None:
+                continue
+            by_path.setdefault(path, []).append((key, filter))
+        if not by_path:
+            return
+
+        self._ensure_connected()
+        paths = list(by_path)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            responses = list(executor.map(self._fetch, paths))
+        for path, (requested_data, expiry) in zip(paths, responses):
+            for key, filter in by_path[path]:
+                self._extract(key, requested_data, filter, expiry, path)
+        logger.info(f"Prefetched {len(paths)} secret paths from vault")
+
+    def _cached(
+        self, key: str, filter: Optional[str]
+    ) -> Optional[Tuple[Union[str, int, float, bool, List[Any]],
+                        Optional[datetime], Optional[str], str]]:
+        """Returns the cached entry of `key`, if it was read with the same filter and
+        either is not a TTL secret, or is a TTL secret that hasn't expired yet
+        """
+        entry = self._secrets.get(key)
+        if entry is not None and entry[2] == filter and (
+                entry[1] is None or datetime.now() < entry[1]):
+            return entry
+        return None
+
+    def _fetch(self, path: str) -> Tuple[Any, Optional[datetime]]:
+        """Returns the data at `path` and its expiry time, reading it if not cached
+
+        Raises:
+            RuntimeError: If the secret cannot be read
+        """
+        cached = self._responses.get(path)
+        staleness = 0.0
+        if cached is not None:
+            data, expiry, _ = cached
+            if expiry is None:
+                return data, expiry
+            staleness = (datetime.now() - expiry).total_seconds()
+            if staleness < 0:
+                return data, expiry
+            if staleness < self.stale_while_revalidate:
+                self._revalidate(path)
+                return data, expiry
 
+        try:
+            return self._flight.do(path, lambda: self._fetch_uncached(path))
+        except RuntimeError as err:
+            if cached is None or staleness >= self.max_staleness:
+                raise
+            logger.warning(
+                f"Could not read secret {path} from vault, using the cached secret "
+                f"that expired {staleness:.0f} seconds ago: {err}")
+            return cached[0], cached[1]
+
+    def _revalidate(self, path: str) -> None:
+        """Reads `path` again in a background thread, unless that is already happening
+        """
+        with self._lock:
+            if path in self._revalidating:
+                return
+            self._revalidating.add(path)
+
+        def revalidate() -> None:
+            try:
+                self._flight.do(path, lambda: self._fetch_uncached(path))
+            except Exception as err:
+                logger.warning(f"Could not refresh secret {path}: {err}")
+            finally:
+                with self._lock:
+                    self._revalidating.discard(path)
+
+        threading.Thread(target=revalidate,
+                         name="gestalt-vault-revalidate",
+                         daemon=True).start()
+
+    def _fetch_uncached(self, path: str) -> Tuple[Any, Optional[datetime]]:
+        # the read this caller was waiting to start may have just finished
+        cached = self._cached_response(path)
+        if cached is not None:
+            return cached
+        return self._read_path(path)
+
+    def _cached_response(
+            self, path: str) -> Optional[Tuple[Any, Optional[datetime]]]:
+        cached = self._responses.get(path)
+        if cached is not None and (cached[1] is None
+                                   or datetime.now() < cached[1]):
+            return cached[0], cached[1]
+        return None
+
+    def _read_path(self, path: str) -> Tuple[Any, Optional[datetime]]:
+        """Reads the data at `path` and caches it with its expiry time
+
+        Raises:
+            RuntimeError: If the secret cannot be read
+        """
         # verify if the token still valid, in case not, call connect()
         self._validate_token_expiration()
-
+        response = self._read(path)
+        requested_data = response["data"].get("data", response["data"])
+        expiry = self._response_expiry(response)
+        refresh_at = None
+        if response["lease_id"]:
+            self._lease_paths[response["lease_id"]] = path
+            # a new lease is waiting in the queue, the refresher picks it up now
+            self._wake.set()
+        elif expiry is not None:
+            refresh_at = self._refresh_time(datetime.now(), expiry)
+        self._responses[path] = (requested_data, expiry, refresh_at)
+        return requested_data, expiry
+
+    def _read(self, path: str) -> Any:
+        """Reads the secret at `path`, returning the whole response
+
+        Raises:
+            RuntimeError: If the secret cannot be read
+        """
+        metrics = self._metrics
+        if metrics is None:
+            return self._read_response(path)
+        start = time.perf_counter()
         try:
-            response = retry_call(
-                self.vault_client.read,
-                fargs=[path],
-                exceptions=(RuntimeError, Timeout),
-                delay=self.delay,
-                tries=self.tries,
-            )
+            response = self._read_response(path)
+        except BaseException:
+            metrics.record_fetch(self.name,
+                                 time.perf_counter() - start,
+                                 failed=True)
+            raise
+        metrics.record_fetch(self.name,
+                             time.perf_counter() - start,
+                             failed=False)
+        return response
+
+    def _read_response(self, path: str) -> Any:
+        try:
+            response = self.retry_policy.call(self.vault_client.read, path)
             if response is None:
                 raise RuntimeError("Gestalt Error: No secrets found")
             if response["lease_id"]:
@@ -164,34 +599,37 @@ class Vault(Provider):
                     response["lease_duration"],
                 )
                 self.dynamic_token_queue.put_nowait(dynamic_token)
-            requested_data = response["data"].get("data", response["data"])
+            return response
         except hvac.exceptions.InvalidPath:
             raise RuntimeError(
                 "Gestalt Error: The secret path or mount is set incorrectly")
         except requests.exceptions.ConnectionError:
             raise RuntimeError(
                 "Gestalt Error: Gestalt couldn't connect to Vault")
+        except CircuitOpenError:
+            raise
         except Exception as err:
             raise RuntimeError(f"Gestalt Error: {err}")
 
-        if filter is None:
-            return requested_data
+    def _extract(self, key: str, requested_data: Any, filter: str,
+                 expiry: Optional[datetime],
+                 path: str) -> Union[str, int, float, bool, List[Any]]:
+        """Applies `filter` to the data of a secret and caches the result as `key`
 
-        secret = requested_data
-        jsonpath_expression = parse(f"${filter}")
-        match = jsonpath_expression.find(secret)
+        Raises:
+            RuntimeError: If the filtered secret is empty
+        """
+        match = _find(requested_data, filter)
 
         if len(match) == 0:
             logger.warning("Path returned not matches for your secret")
 
         returned_value_from_secret: Union[str, int, float,
-                                          List[Any]] = match[0].value
+                                          List[Any]] = match[0]
         if returned_value_from_secret == "":
             raise RuntimeError("Gestalt Error: Empty secret!")
 
-        self._secret_values[key] = returned_value_from_secret
-        if "ttl" in requested_data:
-            self._set_secrets_ttl(requested_data, key)
+        self._secrets[key] = (returned_value_from_secret, expiry, filter, path)
 
         # TODO: unclear what this note means, was left my a previous dev along time ago.
         # should figure out what this does and why it's here.
@@ -204,27 +642,88 @@ class Vault(Provider):
 
     def _is_secret_expired(self, key: str) -> bool:
         now = datetime.now()
-        secret_expires_dt = self._secret_expiry_times[key]
-        is_expired = now >= secret_expires_dt
+        secret_expires_dt = self._secrets[key][1]
+        is_expired = secret_expires_dt is not None and now >= secret_expires_dt
         return is_expired
 
-    def _set_secrets_ttl(self, requested_data: Dict[str, Any],
-                         key: str) -> None:
+    @staticmethod
+    def _secret_expiry(requested_data: Dict[str, Any]) -> datetime:
         last_vault_rotation_str = requested_data["last_vault_rotation"].split(
             ".")[0]  # to the nearest second
         last_vault_rotation_dt = datetime.strptime(last_vault_rotation_str,
                                                    "%Y-%m-%dT%H:%M:%S")
         ttl = requested_data["ttl"]
-        secret_expires_dt = last_vault_rotation_dt + timedelta(seconds=ttl)
-        self._secret_expiry_times[key] = secret_expires_dt
+        secret_expires_dt: datetime = last_vault_rotation_dt + timedelta(
+            seconds=ttl)
+        return secret_expires_dt
+
+    def _response_expiry(self, response: Dict[str, Any]) -> Optional[datetime]:
+        """Returns when a response read from vault expires, if it does
+
+        That is when its lease ends, or for TTL secrets when the secret is rotated,
+        whichever comes first.
+        """
+        expiry = None
+        lease_duration = response.get("lease_duration")
+        if isinstance(lease_duration, (int, float)) and lease_duration > 0:
+            expiry = datetime.now() + timedelta(seconds=lease_duration)
+        requested_data = response["data"].get("data", response["data"])
+        if isinstance(requested_data, dict) and "ttl" in requested_data:
+            secret_expiry = self._secret_expiry(requested_data)
+            if expiry is None or secret_expiry < expiry:
+                expiry = secret_expiry
+        return expiry
+
+    def fetch_info(self) -> Dict[str, int]:
+        """Returns how many times secrets were read from vault, and how many lookups
+        waited for a read of the same path already in flight instead of reading it
+        again
+        """
+        return {
+            "reads": self._flight.calls,
+            "coalesced": self._flight.coalesced
+        }
+
+    def expires_at(self, key: str) -> Optional[datetime]:
+        entry = self._secrets.get(key)
+        return entry[1] if entry is not None else None
+
+    def enable_metrics(self, metrics: Metrics) -> None:
+        """Records reads from vault and lookups of the secret cache into `metrics`
+
+        Reads are timed including their retries. Retries, calls rejected by the
+        circuit breaker and coalesced lookups are collected from the retry policy and
+        `fetch_info` when the metrics are exported.
+        """
+
+        def collect() -> Dict[str, Any]:
+            stats = self.retry_policy.stats()
+            return {
+                "providers": {
+                    self.name: {
+                        "retries": stats["retries"],
+                        "rejected": stats["rejected"],
+                        "coalesced": self.fetch_info()["coalesced"],
+                    }
+                }
+            }
+
+        metrics.add_collector(collect)
+        self._metrics = metrics
 
     @property
     def scheme(self) -> str:
         return self._scheme
 
+    @property
+    def name(self) -> str:
+        """The provider name in the scheme, such as `vault` for `ref+vault://`"""
+        return self._scheme[len("ref+"):-len("://")]
+
     def _validate_token_expiration(self) -> None:
-        if self.kubes_token is not None:
-            expire_time = self.kubes_token[3]
+        token = self.kubes_token
+        if token is not None:
+            expire_time = token[3]
             # Use isoparse to correctly parse the datetime string
             expire_time = isoparse(expire_time)
 
@@ -240,10 +739,103 @@ class Vault(Provider):
 
             if delta_time < EXPIRATION_THRESHOLD_HOURS:
                 logger.info("Re-authenticating with vault")
-                self.connect()
+                with self._lock:
+                    # another thread may have re-authenticated in the meantime
+                    if self.kubes_token is token:
+                        self._connect()
             else:
                 logger.debug(f"Token still valid for: {delta_time} hours")
         else:
             logger.warning(
                 f"Can't reconnect, token information: {self.kubes_token}, not valid"
             )
+
+
+class AsyncVault(AsyncProvider):
+
+    def __init__(self,
+                 vault: Optional[Vault] = None,
+                 executor: Optional[Executor] = None,
+                 **kwargs: Any) -> None:
+        """Vault provider for asyncio applications
+
+        hvac only has a blocking client, so reads from vault run in `executor` and the
+        event loop is free while they are in flight. Concurrent calls needing the same
+        path share a single read. Secrets are cached by the wrapped `Vault`, so cached
+        lookups return without leaving the event loop, and the synchronous `get_*`
+        methods of a `Gestalt` configured with this provider share the same cache.
+
+        An instance should only be used from one event loop.
+
+        Args:
+            vault (Optional: Vault): The vault provider to wrap, one is created from
+                `kwargs` if not provided
+            executor (Optional: Executor): Runs the blocking reads, the default executor
+                of the event loop is used if not provided
+            kwargs: Passed on to `Vault` when `vault` is not provided
+        """
+        self.vault: Vault = vault if vault is not None else Vault(**kwargs)
+        self._executor = executor
+        self._in_flight: Dict[str, asyncio.Future[Tuple[
+            Any, Optional[datetime]]]] = dict()
+        self._coalesced = 0
+
+    @property
+    def scheme(self) -> str:
+        return self.vault.scheme
+
+    def expires_at(self, key: str) -> Optional[datetime]:
+        return self.vault.expires_at(key)
+
+    def fetch_info(self) -> Dict[str, int]:
+        """Returns the `fetch_info` of the wrapped `Vault`, with awaits that shared an
+        in-flight read counted as coalesced
+        """
+        info = self.vault.fetch_info()
+        info["coalesced"] += self._coalesced
+        return info
+
+    async def get(
+            self,
+            key: str,
+            path: str,
+            filter: Optional[str],
+            sep: Optional[str] = "."
+    ) -> Union[str, int, float, bool, List[Any]]:
+        """Gets secret from vault without blocking the event loop
+        Args:
+            key (str): key to get secret from
+            path (str): path to secret
+            filter (str): filter to apply to secret
+            sep (str): delimiter used for flattening
+        Returns:
+            secret (str): secret
+        """
+        entry = self.vault._cached(key, filter)
+        metrics = self.vault._metrics
+        if metrics is not None:
+            metrics.record_cache(self.vault.name, hit=entry is not None)
+        if entry is not None:
+            return entry[0]
+
+        requested_data, expiry = await self._fetch(path)
+        if filter is None:
+            return requested_data  # type: ignore[no-any-return]
+        return self.vault._extract(key, requested_data, filter, expiry, path)
+
+    async def _fetch(self, path: str) -> Tuple[Any, Optional[datetime]]:
+        future = self._in_flight.get(path)
+        if future is not None:
+            self._coalesced += 1
+        else:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._executor, self._fetch_blocking,
+                                          path)
+            self._in_flight[path] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(path, None))
+        # a caller being cancelled must not cancel the read for the others
+        return await asyncio.shield(future)
+
+    def _fetch_blocking(self, path: str) -> Tuple[Any, Optional[datetime]]:
+        self.vault._ensure_connected()
+        return self.vault._fetch(path)
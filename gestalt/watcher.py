@@ -0,0 +1,217 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# inotify(7) flags, see <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# Kubernetes updates mounted ConfigMaps by swapping a symlink, which shows up as a
+# move in the watched directory rather than as a write to the file itself
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM
+              | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+              | IN_MOVE_SELF)
+
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    """Loads libc if it exposes the inotify API, otherwise returns None"""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6',
+                           use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_init1.restype = ctypes.c_int
+        libc.inotify_add_watch.argtypes = [
+            ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32
+        ]
+        libc.inotify_add_watch.restype = ctypes.c_int
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class Watcher:
+
+    def __init__(self,
+                 paths: List[str],
+                 callback: Callable[[], None],
+                 debounce: float = 0.5,
+                 poll_interval: float = 1.0,
+                 use_inotify: bool = True) -> None:
+        """Watches directories and files for changes in a background thread
+
+        Changes are detected with inotify on Linux, and by polling the modification
+        time and size of the files otherwise. Bursts of changes are debounced, so
+        `callback` runs once the watched paths have been quiet for `debounce` seconds.
+
+        Args:
+            paths (List[str]): Directories and files to watch
+            callback (Callable): Called from the watcher thread after changes
+            debounce (float): Seconds without changes to wait for before calling back
+            poll_interval (float): Seconds between checks when polling
+            use_inotify (bool): Use inotify when available, poll otherwise
+        """
+        self.paths = paths
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self._callback = callback
+        self._use_inotify = use_inotify
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._wake_r, self._wake_w = -1, -1
+        self._inotify_fd = -1
+        self._last_fingerprint: Dict[str, Tuple[int, int]] = dict()
+
+    @property
+    def uses_inotify(self) -> bool:
+        """Whether changes are detected with inotify rather than polling"""
+        return self._inotify_fd >= 0
+
+    def start(self) -> None:
+        """Starts the watcher thread
+
+        Raises:
+            RuntimeError: If the watcher is already running
+        """
+        if self._thread is not None:
+            raise RuntimeError('Gestalt Error: Watcher is already running')
+        self._stop.clear()
+        if self._use_inotify:
+            self._inotify_fd = self._init_inotify()
+        if self.uses_inotify:
+            self._wake_r, self._wake_w = os.pipe()
+            target = self._run_inotify
+        else:
+            self._last_fingerprint = self._fingerprint()
+            target = self._run_polling
+        self._thread = threading.Thread(target=target,
+                                        name='gestalt-watcher',
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops the watcher thread and waits for it to exit"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        if self._wake_w >= 0:
+            os.write(self._wake_w, b'\0')
+        self._thread.join()
+        self._thread = None
+        for fd in (self._inotify_fd, self._wake_r, self._wake_w):
+            if fd >= 0:
+                os.close(fd)
+        self._inotify_fd, self._wake_r, self._wake_w = -1, -1, -1
+
+    def _init_inotify(self) -> int:
+        """Sets up inotify watches on every path, returns -1 if that is not possible"""
+        libc = _load_libc()
+        if libc is None:
+            return -1
+        fd: int = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return -1
+        for path in self._watch_dirs():
+            if libc.inotify_add_watch(fd, os.fsencode(path), WATCH_MASK) < 0:
+                logger.warning(
+                    f"Could not watch {path} with inotify: "
+                    f"{os.strerror(ctypes.get_errno())}, polling instead")
+                os.close(fd)
+                return -1
+        return fd
+
+    def _watch_dirs(self) -> List[str]:
+        """Lists the directories to watch, files are watched through their parent
+
+        Watching the parent directory catches files being replaced, which a watch on
+        the file itself would not survive.
+        """
+        dirs: List[str] = []
+        for path in self.paths:
+            d = path if os.path.isdir(path) else os.path.dirname(path)
+            if d not in dirs:
+                dirs.append(d)
+        return dirs
+
+    def _run_inotify(self) -> None:
+        deadline: Optional[float] = None
+        while not self._stop.is_set():
+            timeout = None
+            if deadline is not None:
+                timeout = max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self._inotify_fd, self._wake_r], [],
+                                        [], timeout)
+            if self._inotify_fd in ready:
+                # the events themselves are not needed, only that something changed
+                while self._drain(self._inotify_fd):
+                    pass
+                deadline = time.monotonic() + self.debounce
+            elif deadline is not None and time.monotonic() >= deadline:
+                deadline = None
+                self._notify()
+
+    @staticmethod
+    def _drain(fd: int) -> bool:
+        try:
+            return len(os.read(fd, 65536)) > 0
+        except BlockingIOError:
+            return False
+
+    def _run_polling(self) -> None:
+        changed_at: Optional[float] = None
+        while not self._stop.wait(self.poll_interval if changed_at is None else
+                                  min(self.poll_interval, self.debounce)):
+            current = self._fingerprint()
+            if current != self._last_fingerprint:
+                self._last_fingerprint = current
+                changed_at = time.monotonic()
+            elif changed_at is not None and time.monotonic(
+            ) - changed_at >= self.debounce:
+                changed_at = None
+                self._notify()
+
+    def _fingerprint(self) -> Dict[str, Tuple[int, int]]:
+        """Returns the modification time and size of every watched file"""
+        files: List[str] = []
+        for path in self.paths:
+            if os.path.isdir(path):
+                try:
+                    files.extend(
+                        os.path.join(path, f) for f in os.listdir(path))
+                except OSError:
+                    continue
+            else:
+                files.append(path)
+        fingerprint: Dict[str, Tuple[int, int]] = dict()
+        for f in files:
+            try:
+                st = os.stat(f)
+            except OSError:
+                continue
+            fingerprint[f] = (st.st_mtime_ns, st.st_size)
+        return fingerprint
+
+    def _notify(self) -> None:
+        try:
+            self._callback()
+        except Exception:
+            logger.exception(
+                "Gestalt Error: Failed to reload the configuration")
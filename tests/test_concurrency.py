@@ -0,0 +1,85 @@
+# type: ignore
+
+from threading import Event, Thread
+import json
+
+import pytest
+
+import gestalt
+
+READERS = 8
+
+
+def _write_version(path, version):
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(
+        json.dumps({
+            "version": {
+                "a": version,
+                "b": version
+            },
+            "static": "value",
+            "pad": "x" * version,
+        }))
+    tmp.replace(path)
+
+
+@pytest.mark.parametrize("mode", ["plain", "cache", "frozen"])
+def test_concurrent_reads_and_writes(tmp_path, mode):
+    config = tmp_path / "config.json"
+    _write_version(config, 0)
+    g = gestalt.Gestalt()
+    g.add_config_file(str(config))
+    g.build_config()
+    g.set_int("counter", 0)
+    if mode == "cache":
+        g.enable_cache()
+    elif mode == "frozen":
+        g.freeze()
+
+    stop = Event()
+    errors = []
+    reads = [0] * READERS
+
+    def reader(i):
+        last_counter = -1
+        last_version = -1
+        try:
+            while not stop.is_set():
+                counter = g.get_int("counter")
+                assert counter >= last_counter
+                last_counter = counter
+                version = g.get_int("version.a")
+                assert version >= last_version
+                last_version = version
+                assert g.get_string("static") == "value"
+                # a single dump reads a single state, so both keys always match
+                dumped = json.loads(g.dump())
+                assert dumped["version.a"] == dumped["version.b"]
+                reads[i] += 1
+        except Exception as e:
+            errors.append(e)
+
+    def set_writer():
+        for i in range(1, 200):
+            g.set_int("counter", i)
+
+    def file_writer():
+        for version in range(1, 10):
+            _write_version(config, version)
+            g.rebuild_config()
+
+    readers = [Thread(target=reader, args=(i, )) for i in range(READERS)]
+    writers = [Thread(target=set_writer), Thread(target=file_writer)]
+    for t in readers + writers:
+        t.start()
+    for t in writers:
+        t.join()
+    stop.set()
+    for t in readers:
+        t.join()
+
+    assert not errors, errors
+    assert all(reads)
+    assert g.get_int("counter") == 199
+    assert g.get_int("version.b") == 9
@@ -4,11 +4,20 @@ from unittest.mock import patch, Mock
 
 from gestalt.vault import Vault
 from gestalt import merge_into
+from gestalt.utils import SingleFlight, flatten, merge_flatten
 import pytest
+import asyncio
 import os
+import sys
+import threading
+import time
 import gestalt
 import hvac
+import json
+import yaml
+from dataclasses import dataclass, field
 from queue import Queue
+from typing import Dict, List, Optional
 
 
 # Testing member function
@@ -51,6 +60,92 @@ def test_combine_into_empty_dict():
     assert combine == {"local": 1234}
 
 
+def test_merge_flatten_matches_merge_into():
+    layers = [
+        {
+            "local": 1234,
+            "pg": {
+                "host": "dict1_pg",
+                "pass": "dict1_pg"
+            },
+            "empty": {}
+        },
+        {
+            "local": 1234,
+            "pg": {
+                "host": "dict2_pg",
+                "opts": {
+                    "ssl": True
+                }
+            }
+        },
+        {
+            "listing": ["dog"],
+            "pg": {
+                "opts": {
+                    "timeout": 1.5
+                }
+            }
+        },
+    ]
+    merged = {}
+    for layer in layers:
+        merge_into(layer, merged)
+    assert merge_flatten(layers) == flatten(merged)
+    assert merge_flatten(layers, sep="/")["pg/opts/ssl"] is True
+
+
+def test_merge_flatten_value_replaces_mapping():
+    layers = [{"pg": {"host": "a", "opts": {"ssl": True}}}, {"pg": "dsn"}]
+    assert merge_flatten(layers) == {"pg": "dsn"}
+    layers = [{"pg": "dsn"}, {"pg": {"host": "a"}}]
+    assert merge_flatten(layers) == {"pg.host": "a"}
+
+
+def test_merge_flatten_deep():
+    depth = sys.getrecursionlimit() * 2
+    layer = leaf = {}
+    for _ in range(depth):
+        leaf["n"] = {}
+        leaf = leaf["n"]
+    leaf["value"] = 1
+    flat = merge_flatten([layer])
+    assert flat == {".".join(["n"] * depth + ["value"]): 1}
+
+
+def test_singleflight_shares_errors():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    errors = []
+
+    def fail():
+        started.set()
+        release.wait()
+        raise RuntimeError("boom")
+
+    def call():
+        try:
+            flight.do("key", fail)
+        except RuntimeError as err:
+            errors.append(err)
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    threads[0].start()
+    started.wait()
+    for t in threads[1:]:
+        t.start()
+    while flight.coalesced < 2:
+        time.sleep(0.01)
+    release.set()
+    for t in threads:
+        t.join()
+    assert len(errors) == 3
+    assert (flight.calls, flight.coalesced) == (1, 2)
+    # the key is free again once the call finished
+    assert flight.do("key", lambda: 1) == 1
+
+
 # Testing JSON Loading
 def test_loading_json():
     g = gestalt.Gestalt()
@@ -119,6 +214,13 @@ def test_loading_dir_bad_files_yaml_only():
         assert "but cannot be read as such" in terr.value.args[0]
 
 
+def test_yaml_loader():
+    if yaml.__with_libyaml__:
+        assert gestalt.YAML_LOADER is yaml.CFullLoader
+    else:
+        assert gestalt.YAML_LOADER is yaml.FullLoader
+
+
 def test_loading_yaml_file():
     g = gestalt.Gestalt()
     g.add_config_file("./tests/testdata/testyaml.yaml")
@@ -268,6 +370,195 @@ def test_get_yaml_missing_nested_default():
     assert testval == "default"
 
 
+def _write_fragments(path, count):
+    for i in range(count):
+        (path / f"frag{i:03}.json").write_text(
+            json.dumps({
+                "shared": i,
+                "group": {
+                    f"key{i}": i,
+                    "last": f"json{i}"
+                }
+            }))
+        (path / f"frag{i:03}.yaml"
+         ).write_text(f"shared_yaml: {i}\ngroup:\n  last: yaml{i}\n")
+
+
+def test_build_config_parallel_order(tmp_path):
+    _write_fragments(tmp_path, 20)
+    dumps = []
+    for max_workers, use_processes in ((1, False), (None, False), (4, True)):
+        g = gestalt.Gestalt()
+        g.add_config_path(str(tmp_path))
+        g.build_config(max_workers=max_workers, use_processes=use_processes)
+        assert g.get_int("shared") == 19
+        assert g.get_string("group.last") == "yaml19"
+        assert g.get_int("group.key7") == 7
+        dumps.append(g.dump())
+    assert dumps[0] == dumps[1] == dumps[2]
+
+
+def test_build_config_parallel_bad_file(tmp_path):
+    _write_fragments(tmp_path, 5)
+    (tmp_path / "frag002.json").write_text("{not json")
+    g = gestalt.Gestalt()
+    g.add_config_path(str(tmp_path))
+    with pytest.raises(ValueError) as terr:
+        g.build_config()
+    assert "frag002.json" in terr.value.args[0]
+
+
+def test_build_config_reuses_parsed_files(tmp_path):
+    _write_fragments(tmp_path, 3)
+    g = gestalt.Gestalt()
+    g.add_config_path(str(tmp_path))
+    with patch("gestalt._load_file", wraps=gestalt._load_file) as mock_load:
+        g.build_config()
+        assert mock_load.call_count == 6
+        (tmp_path / "frag001.json").write_text('{"shared": 100}')
+        g.build_config()
+        assert mock_load.call_count == 7
+    assert g.get_int("shared") == 2
+
+
+def test_disk_cache_warm_start(tmp_path):
+    config = tmp_path / "config"
+    config.mkdir()
+    _write_fragments(config, 3)
+    cache_dir = str(tmp_path / "cache")
+
+    g = gestalt.Gestalt()
+    g.add_config_path(str(config))
+    g.enable_disk_cache(cache_dir)
+    g.build_config()
+    expected = g.dump()
+
+    with patch("gestalt._load_file", wraps=gestalt._load_file) as mock_load:
+        g = gestalt.Gestalt()
+        g.add_config_path(str(config))
+        g.enable_disk_cache(cache_dir)
+        g.build_config()
+        assert mock_load.call_count == 0
+        assert g.dump() == expected
+
+
+def test_disk_cache_reparses_changed_files(tmp_path):
+    config = tmp_path / "config"
+    config.mkdir()
+    _write_fragments(config, 3)
+    cache_dir = str(tmp_path / "cache")
+
+    g = gestalt.Gestalt()
+    g.add_config_path(str(config))
+    g.enable_disk_cache(cache_dir)
+    g.build_config()
+
+    # same content with a new modification time is not parsed again
+    touched = config / "frag000.yaml"
+    os.utime(touched, ns=(0, 0))
+    (config / "frag002.yaml").write_text("shared_yaml: 100\n")
+    with patch("gestalt._load_file", wraps=gestalt._load_file) as mock_load:
+        g = gestalt.Gestalt()
+        g.add_config_path(str(config))
+        g.enable_disk_cache(cache_dir)
+        g.build_config()
+        assert mock_load.call_count == 1
+    assert g.get_int("shared_yaml") == 100
+    assert g.get_string("group.last") == "yaml1"
+
+
+def test_disk_cache_corrupt(tmp_path):
+    cache_dir = tmp_path / "cache"
+    g = gestalt.Gestalt()
+    g.add_config_path("./tests/testdata")
+    g.enable_disk_cache(str(cache_dir))
+    g.build_config()
+    for f in cache_dir.iterdir():
+        f.write_bytes(b"garbage")
+    g = gestalt.Gestalt()
+    g.add_config_path("./tests/testdata")
+    g.enable_disk_cache(str(cache_dir))
+    g.build_config()
+    assert g.get_string("yarn") == "blue skies"
+
+
+def test_rebuild_config(tmp_path):
+    _write_fragments(tmp_path, 3)
+    g = gestalt.Gestalt()
+    g.add_config_path(str(tmp_path))
+    g.build_config()
+    with patch("gestalt._load_file", wraps=gestalt._load_file) as mock_load:
+        assert g.rebuild_config() == set()
+        (tmp_path / "frag002.yaml").write_text("group:\n  last: changed\n")
+        (tmp_path / "frag000.json").unlink()
+        changed = g.rebuild_config()
+        assert mock_load.call_count == 1
+    assert changed == {"group.last", "group.key0", "shared_yaml"}
+    assert g.get_string("group.last") == "changed"
+    assert g.get_int("shared_yaml") == 1
+    with pytest.raises(ValueError):
+        g.get_int("group.key0")
+
+
+def test_rebuild_config_keeps_sets(tmp_path):
+    _write_fragments(tmp_path, 1)
+    g = gestalt.Gestalt()
+    g.add_config_path(str(tmp_path))
+    g.build_config()
+    g.set_int("shared", 42)
+    (tmp_path / "frag000.json").write_text('{"shared": 7, "extra": 1.5}')
+    assert g.rebuild_config() == {"shared", "group.key0", "extra"}
+    assert g.get_int("shared") == 42
+    assert g.get_float("extra") == 1.5
+
+
+def test_lazy_loading(tmp_path):
+    _write_fragments(tmp_path, 3)
+    broken = "broken:\n  - [unclosed\nother: 1\n"
+    (tmp_path / "frag003.yaml").write_text(broken)
+    (tmp_path / "frag004.yaml").write_text("base: &b\n  x: 1\nderived: *b\n")
+    quoted = 'quoted: "a long\nunset: b"\nz: 1\n'
+    (tmp_path / "frag005.yaml").write_text(quoted)
+    g = gestalt.Gestalt()
+    g.add_config_path(str(tmp_path))
+    g.enable_lazy_loading()
+    with patch("gestalt._load_file", wraps=gestalt._load_file) as mock_load:
+        g.build_config()
+        # YAML files using anchors, or with values spanning top-level lines, cannot
+        # be split and are parsed up front
+        assert mock_load.call_count == 5
+    assert g.get_int("group.key1") == 1
+    assert g.get_string("group.last") == "yaml2"
+    assert g.get_int("shared_yaml") == 2
+    assert g.get_int("other") == 1
+    assert g.get_int("derived.x") == 1
+    assert g.get_string("quoted") == "a long unset: b"
+    assert g.get_int("z") == 1
+    with pytest.raises(ValueError):
+        g.get_string("unset")
+    with pytest.raises(ValueError):
+        g.get_list("broken")
+    # a span that cannot be parsed on its own is read from the whole file
+    section = gestalt._Section("frag005.yaml", "quoted", text=quoted, end=15)
+    assert section.load() == {"quoted": "a long unset: b"}
+
+
+def test_lazy_loading_rebuild(tmp_path):
+    _write_fragments(tmp_path, 2)
+    g = gestalt.Gestalt()
+    g.add_config_path(str(tmp_path))
+    g.enable_lazy_loading()
+    g.build_config()
+    assert g.get_string("group.last") == "yaml1"
+    (tmp_path /
+     "frag001.yaml").write_text("shared_yaml: 5\ngroup:\n  last: changed\n")
+    # only sections that were read are compared
+    assert g.rebuild_config() == {"group.last"}
+    assert g.get_string("group.last") == "changed"
+    assert g.get_int("shared_yaml") == 5
+    assert json.loads(g.dump())["group.key0"] == 0
+
+
 # Test Set Overriding
 def test_set_string():
     g = gestalt.Gestalt()
@@ -398,6 +689,18 @@ def test_get_env_bad_type():
         assert "could not be converted to type" in terr
 
 
+def test_env_read_once():
+    g = gestalt.Gestalt()
+    g.auto_env()
+    os.environ["MY_CACHED_KEY"] = "first"
+    assert g.get_string("my.cached.key") == "first"
+    os.environ["MY_CACHED_KEY"] = "second"
+    assert g.get_string("my.cached.key") == "first"
+    g.refresh_env()
+    assert g.get_string("my.cached.key") == "second"
+    del os.environ["MY_CACHED_KEY"]
+
+
 # Test Default Values
 def test_set_default_string():
     g = gestalt.Gestalt()
@@ -494,6 +797,143 @@ def test_set_default_bad_type_set_config():
         assert "Set config has" in terr
 
 
+# Test Compiled Lookups
+def test_freeze_matches_lookup():
+    g = gestalt.Gestalt()
+    g.add_config_path("./tests/testdata")
+    g.build_config()
+    g.freeze()
+    assert g.get_string("yarn") == "blue skies"
+    assert g.get_int("numbers") == 12345678
+    assert g.get_string("deep_yaml.nest1.nest2.foo") == "hello"
+    assert g.get_string("deep_yaml.nest1.nest2.fob", "default") == "default"
+    with pytest.raises(TypeError):
+        g.get_string("numbers")
+    with pytest.raises(ValueError):
+        g.get_string("non-exist")
+
+
+def test_freeze_set_invalidates():
+    g = gestalt.Gestalt()
+    g.add_config_path("./tests/testdata")
+    g.build_config()
+    g.freeze()
+    assert g.get_int("numbers") == 12345678
+    g.set_int("numbers", 6543)
+    assert g.get_int("numbers") == 6543
+    g.set_default_string("nonexisttest", "otherdefval")
+    assert g.get_string("nonexisttest") == "otherdefval"
+
+
+def test_freeze_default_precedence():
+    g = gestalt.Gestalt()
+    g.set_default_int("mykey", 1234)
+    g.freeze()
+    assert g.get_int("mykey") == 1234
+    assert g.get_int("mykey", 5) == 5
+    with pytest.raises(TypeError):
+        g.get_string("mykey")
+
+
+def test_freeze_env():
+    g = gestalt.Gestalt()
+    g.add_config_path("./tests/testdata")
+    g.build_config()
+    g.auto_env()
+    os.environ["NUMBERS"] = "42"
+    g.freeze()
+    del os.environ["NUMBERS"]
+    assert g.get_int("numbers") == 42
+    assert g.get_string("numbers") == "42"
+    os.environ["NUMBERS"] = "notanumber"
+    g.refresh_env()
+    with pytest.raises(TypeError) as terr:
+        g.get_int("numbers")
+        assert "could not be converted to type" in terr
+    del os.environ["NUMBERS"]
+
+
+def test_unfreeze():
+    g = gestalt.Gestalt()
+    g.set_string("mykey", "myval")
+    g.freeze()
+    assert g.get_string("mykey") == "myval"
+    g.unfreeze()
+    assert g.get_string("mykey") == "myval"
+
+
+def test_cache_hits_and_misses():
+    g = gestalt.Gestalt()
+    g.add_config_path("./tests/testdata")
+    g.build_config()
+    g.enable_cache()
+    assert g.get_string("yarn") == "blue skies"
+    assert g.get_string("yarn") == "blue skies"
+    assert g.get_string("nonexist", "mydefval") == "mydefval"
+    assert g.get_string("nonexist", "otherval") == "otherval"
+    info = g.cache_info()
+    assert info["hits"] == 1
+    assert info["misses"] == 3
+    assert info["size"] == 3
+
+
+def test_cache_invalidation():
+    g = gestalt.Gestalt()
+    g.enable_cache()
+    g.set_default_int("mykey", 1)
+    assert g.get_int("mykey") == 1
+    g.set_int("mykey", 2)
+    assert g.get_int("mykey") == 2
+    g.add_config_path("./tests/testdata")
+    g.build_config()
+    assert g.cache_info()["size"] == 0
+
+
+def test_cache_eviction():
+    g = gestalt.Gestalt()
+    g.enable_cache(max_size=2)
+    g.set_string("a", "1")
+    g.set_string("b", "2")
+    g.set_string("c", "3")
+    g.get_string("a")
+    g.get_string("b")
+    g.get_string("a")
+    g.get_string("c")
+    assert g.cache_info()["size"] == 2
+    g.get_string("a")
+    assert g.cache_info()["hits"] == 2
+
+
+def test_cache_bad_size():
+    g = gestalt.Gestalt()
+    with pytest.raises(ValueError):
+        g.enable_cache(max_size=0)
+
+
+def test_cache_provider_expiry():
+    with patch("gestalt.vault.hvac.Client.read") as mock_read:
+        v = Vault(role=None, jwt=None)
+        v._is_connected = True
+        mock_read.return_value = {
+            "lease_id": "",
+            "data": {
+                "last_vault_rotation": "2023-05-31T14:24:41.724285249Z",
+                "ttl": 60,
+                "username": "foo",
+            },
+        }
+        g = gestalt.Gestalt()
+        g.add_config_file("./tests/testvault/testsfdynamic.json")
+        g.configure_provider("vault", v)
+        g.build_config()
+        g.enable_cache()
+        assert g.get_string("username") == "foo"
+        mock_read.return_value["data"]["username"] = "bar"
+        assert g.get_string("username") == "bar"
+        assert mock_read.call_count == 2
+        assert g.cache_info()["hits"] == 0
+
+
 def test_vault_setup():
     vault = Vault(role=None, jwt=None)
     assert vault.vault_client.is_authenticated() is True
@@ -607,3 +1047,431 @@ def test_vault_start_dynamic_lease(mock_vault_workers):
             mock_vault_client_read.stop()
             mock_dynamic_token_queue.stop()
             mock_queue.stop()
+
+
+def test_prefetch_secrets(tmp_path):
+    secrets = {
+        "db": {
+            "username": "foo",
+            "password": "bar"
+        },
+        "api": {
+            "token": "baz"
+        },
+    }
+    config = {
+        "db": {
+            "username": "ref+vault://secret/db#.username",
+            "password": "ref+vault://secret/db#.password",
+        },
+        "api_token": "ref+vault://secret/api#.token",
+    }
+    (tmp_path / "config.json").write_text(json.dumps(config))
+    with patch("gestalt.vault.hvac.Client.read") as mock_read:
+        mock_read.side_effect = lambda path: {
+            "lease_id": "",
+            "data": secrets[path.split("/")[-1]],
+        }
+        v = Vault(role=None, jwt=None)
+        v._is_connected = True
+        g = gestalt.Gestalt()
+        g.add_config_path(str(tmp_path))
+        g.configure_provider("vault", v)
+        g.build_config()
+        g.prefetch_secrets()
+        assert mock_read.call_count == 2
+        assert g.get_string("db.username") == "foo"
+        assert g.get_string("db.password") == "bar"
+        assert g.get_string("api_token") == "baz"
+        assert mock_read.call_count == 2
+
+
+def test_aget(tmp_path):
+    config = {
+        "db": "ref+vault://secret/db#.credentials",
+        "api_token": "ref+vault://secret/api#.token",
+        "replicas": 3,
+    }
+    (tmp_path / "config.json").write_text(json.dumps(config))
+    secrets = {
+        "db": {
+            "credentials": {
+                "username": "foo"
+            }
+        },
+        "api": {
+            "token": "baz"
+        },
+    }
+    with patch("gestalt.vault.hvac.Client.read") as mock_read:
+        mock_read.side_effect = lambda path: {
+            "lease_id": "",
+            "data": secrets[path.split("/")[-1]],
+        }
+        v = gestalt.AsyncVault(role=None, jwt=None)
+        v.vault._is_connected = True
+        g = gestalt.Gestalt()
+        g.add_config_path(str(tmp_path))
+        g.configure_provider("vault", v)
+        g.build_config()
+
+        async def lookups():
+            return (await g.aget_string("api_token"), await
+                    g.aget_string("db.username"), await g.aget_int("replicas"))
+
+        assert asyncio.run(lookups()) == ("baz", "foo", 3)
+        assert mock_read.call_count == 2
+        assert g.get_string("api_token") == "baz"
+        assert g.get_string("db.username") == "foo"
+        assert mock_read.call_count == 2
+
+
+def test_aget_reads_off_event_loop(tmp_path):
+    (tmp_path / "config.json").write_text(
+        json.dumps({"password": "ref+vault://secret/db#.password"}))
+    read_threads = []
+
+    def read(path):
+        read_threads.append(threading.current_thread())
+        # an expired TTL secret, so every lookup reads it again
+        return {
+            "lease_id": "",
+            "data": {
+                "last_vault_rotation": "2023-05-31T14:24:41.0Z",
+                "ttl": 60,
+                "password": "foo",
+            },
+        }
+
+    with patch("gestalt.vault.hvac.Client.read", side_effect=read):
+        v = gestalt.AsyncVault(role=None, jwt=None)
+        v.vault._is_connected = True
+        g = gestalt.Gestalt()
+        g.add_config_path(str(tmp_path))
+        g.configure_provider("vault", v)
+        g.build_config()
+
+        async def lookups():
+            loop_thread = threading.current_thread()
+            values = [await g.aget_string("password") for _ in range(2)]
+            return loop_thread, values
+
+        loop_thread, values = asyncio.run(lookups())
+    assert values == ["foo", "foo"]
+    assert len(read_threads) == 2
+    assert loop_thread not in read_threads
+
+
+def test_local_file_provider(tmp_path):
+    secrets = tmp_path / "secrets"
+    (secrets / "db").mkdir(parents=True)
+    (secrets / "db" / "password").write_text("hunter2\n")
+    (secrets / "db" / "..data").mkdir()
+    (secrets / "api.json").write_text(json.dumps({"token": "baz"}))
+    (secrets / "cert").write_text("-----BEGIN-----\n")
+    config = tmp_path / "config"
+    config.mkdir()
+    (config / "config.json").write_text(
+        json.dumps({
+            "db": f"ref+file://{secrets / 'db'}#",
+            "password": f"ref+file://{secrets / 'db'}#.password",
+            "api_token": "ref+file://api.json#.token",
+            "cert": f"ref+file://{secrets / 'cert'}#",
+        }))
+    g = gestalt.Gestalt()
+    g.add_config_path(str(config))
+    g.configure_provider("file", gestalt.LocalFile(root=str(secrets)))
+    g.build_config()
+    g.enable_cache()
+    assert g.get_string("password") == "hunter2"
+    assert g.get_string("db.password") == "hunter2"
+    assert g.get_string("api_token") == "baz"
+    assert g.get_string("cert") == "-----BEGIN-----"
+
+    (secrets / "db" / "password").write_text("correct horse\n")
+    assert g.get_string("password") == "correct horse"
+
+
+def test_local_file_provider_reads_changed_files_only(tmp_path):
+    secret = tmp_path / "password"
+    secret.write_text("hunter2")
+    provider = gestalt.LocalFile()
+    with patch("builtins.open", wraps=open) as mock_open:
+        assert provider.get(str(secret), str(secret), None) == "hunter2"
+        assert provider.get(str(secret), str(secret), None) == "hunter2"
+        assert mock_open.call_count == 1
+        secret.write_text("hunter22")
+        assert provider.get(str(secret), str(secret), None) == "hunter22"
+        assert mock_open.call_count == 2
+    with pytest.raises(RuntimeError):
+        provider.get("missing", str(tmp_path / "missing"), None)
+
+
+def test_configure_custom_provider(tmp_path):
+
+    class Static(gestalt.Provider):
+
+        def __init__(self):
+            pass
+
+        def get(self, key, path, filter, sep="."):
+            return f"{path}{filter}"
+
+        @property
+        def scheme(self):
+            return "ref+static://"
+
+    (tmp_path / "config.json").write_text(
+        json.dumps({"nested": {
+            "key": "ref+static://some/path#.field"
+        }}))
+    g = gestalt.Gestalt()
+    g.add_config_path(str(tmp_path))
+    with pytest.raises(ValueError):
+        g.configure_provider("other", Static())
+    with pytest.raises(TypeError):
+        g.configure_provider("static", object())
+    g.configure_provider("static", Static())
+    g.configure_provider("vault", Vault(role=None, jwt=None))
+    g.build_config()
+    assert g.get_string("nested.key") == "some/path.field"
+    assert set(g.providers) == {"static", "vault"}
+
+
+def test_metrics():
+    g = gestalt.Gestalt()
+    g.add_config_path('./tests/testdata')
+    g.build_config()
+    with pytest.raises(RuntimeError):
+        g.unused_keys()
+    metrics = g.enable_metrics()
+    g.get_string('yarn')
+    g.get_string('yarn')
+    with pytest.raises(ValueError):
+        g.get_string('missing')
+
+    assert metrics.reads() == {'yarn': 2, 'missing': 1}
+    unused = g.unused_keys()
+    assert 'yarn' not in unused
+    assert 'numbers' in unused
+    lookups = metrics.to_dict()['lookups']
+    assert lookups['count'] == 3
+    assert lookups['errors'] == 1
+    assert lookups['buckets'][float('inf')] == 3
+    lines = metrics.to_prometheus().splitlines()
+    assert 'gestalt_reads_total{key="yarn"} 2' in lines
+    assert 'gestalt_lookup_seconds_count 3' in lines
+    assert '# TYPE gestalt_lookup_seconds histogram' in lines
+
+
+def test_get_section(tmp_path):
+    (tmp_path / "config.json").write_text(
+        json.dumps({
+            "db": {
+                "host": "localhost",
+                "port": 5432,
+                "replica": {
+                    "host": "replica"
+                }
+            },
+            "dbx": "not in the section",
+            "api": "url",
+        }))
+    g = gestalt.Gestalt()
+    g.add_config_path(str(tmp_path))
+    g.build_config()
+    g.set_string("db.host", "primary")
+    g.set_default_int("db.pool", 10)
+    g.set_default_int("db.port", 1)
+    with patch.dict(os.environ, {"DB_PORT": "6543"}):
+        g.auto_env()
+        assert g.get_section("db") == {
+            "host": "primary",
+            "port": 6543,
+            "pool": 10,
+            "replica": {
+                "host": "replica"
+            },
+        }
+    assert g.get_section("db.replica") == {"host": "replica"}
+    assert g.get_section("")["api"] == "url"
+    with pytest.raises(TypeError):
+        g.get_section("api")
+    with pytest.raises(ValueError):
+        g.get_section("missing")
+
+
+def test_get_section_metrics():
+    g = gestalt.Gestalt()
+    g.set_string("db.host", "localhost")
+    g.set_int("db.port", 5432)
+    g.set_string("api", "url")
+    metrics = g.enable_metrics()
+    assert g.get_section("db") == {"host": "localhost", "port": 5432}
+    assert metrics.reads() == {"db.host": 1, "db.port": 1}
+    assert g.unused_keys() == ["api"]
+
+    @dataclass
+    class Service:
+        db: Dict[str, object]
+
+    g.bind(Service)
+    assert metrics.reads() == {"db.host": 2, "db.port": 2}
+
+
+def test_get_section_reads_each_path_once(tmp_path):
+    (tmp_path / "config.json").write_text(
+        json.dumps({
+            "db": {
+                "username": "ref+vault://secret/data/db#.username",
+                "password": "ref+vault://secret/data/db#.password",
+                "api": "ref+vault://secret/data/api#",
+            }
+        }))
+    secrets = {
+        "db": {
+            "username": "foo",
+            "password": "bar"
+        },
+        "api": {
+            "token": "baz"
+        }
+    }
+    with patch("gestalt.vault.hvac.Client.read") as mock_read:
+        mock_read.side_effect = lambda path: {
+            "lease_id": "",
+            "data": secrets[path.split("/")[-1]],
+        }
+        v = Vault(role=None, jwt=None)
+        v._is_connected = True
+        g = gestalt.Gestalt()
+        g.add_config_path(str(tmp_path))
+        g.configure_provider("vault", v)
+        g.build_config()
+        assert g.get_section("db") == {
+            "username": "foo",
+            "password": "bar",
+            "api": {
+                "token": "baz"
+            },
+        }
+        assert g.get_section("db.api") == {"token": "baz"}
+        assert mock_read.call_count == 2
+
+
+@dataclass
+class _Database:
+    host: str
+    port: int
+    replicas: List[str] = field(default_factory=list)
+
+
+@dataclass
+class _Service:
+    name: str
+    db: _Database
+    ratio: float = 0.5
+    debug: Optional[bool] = None
+    labels: Optional[Dict[str, str]] = None
+
+    @property
+    def dsn(self):
+        return f"{self.db.host}:{self.db.port}"
+
+    def __str__(self):
+        return self.name
+
+
+def test_bind(tmp_path):
+    config = tmp_path / "config.json"
+    config.write_text(
+        json.dumps({
+            "service": {
+                "name": "api",
+                "db": {
+                    "host": "localhost",
+                    "port": 5432
+                },
+                "labels": {
+                    "team": "core"
+                },
+            }
+        }))
+    g = gestalt.Gestalt()
+    g.add_config_path(str(tmp_path))
+    g.build_config()
+    service = g.bind(_Service, "service")
+    assert not hasattr(service, "__dict__")
+    # dataclasses without __slots__ are bound to a slotted copy of the class
+    assert not isinstance(service, _Service)
+    assert type(service).__name__ == "_Service"
+    assert str(service) == "api"
+    assert repr(service).startswith("_Service(name='api', db=_Database(")
+    assert service.name == "api"
+    assert service.db.host == "localhost"
+    assert service.db.replicas == []
+    assert service.ratio == 0.5
+    assert service.debug is None
+    assert service.labels == {"team": "core"}
+    assert service.dsn == "localhost:5432"
+
+    db = service.db
+    config.write_text(
+        json.dumps({
+            "service": {
+                "name": "api",
+                "db": {
+                    "host": "db.internal",
+                    "port": 5432
+                }
+            }
+        }))
+    os.utime(config, ns=(time.time_ns() + 10**9, time.time_ns() + 10**9))
+    g.rebuild_config()
+    assert service.db is db
+    assert service.dsn == "db.internal:5432"
+    assert service.labels is None
+
+    # a reload that no longer validates keeps the values bound before
+    config.write_text(json.dumps({"service": {"name": "api"}}))
+    os.utime(config,
+             ns=(time.time_ns() + 2 * 10**9, time.time_ns() + 2 * 10**9))
+    g.rebuild_config()
+    assert service.dsn == "db.internal:5432"
+
+
+def test_bind_lists_every_error():
+    g = gestalt.Gestalt()
+    g.set_string("service.name", "api")
+    g.set_string("service.db.port", "5432")
+    g.set_list("service.db.replicas", ["a", 1])
+    g.build_config()
+    with pytest.raises(ValueError) as err:
+        g.bind(_Service, "service")
+    message = str(err.value)
+    assert "3 fields are invalid" in message
+    assert "service.db.host: not in any configuration" in message
+    assert "service.db.port" in message
+    assert "service.db.replicas" in message
+
+    class NotASchema:
+        name: str
+
+    with pytest.raises(TypeError):
+        g.bind(NotASchema)
+
+
+def test_bind_slotted_class():
+
+    class Limits:
+        __slots__ = ("requests", "burst")
+        requests: int
+        burst: int
+
+    g = gestalt.Gestalt()
+    g.set_int("requests", 100)
+    g.set_int("burst", 10)
+    g.build_config()
+    limits = g.bind(Limits)
+    assert isinstance(limits, Limits)
+    assert (limits.requests, limits.burst) == (100, 10)
@@ -1,7 +1,17 @@
 # type: ignore
 
-from gestalt.vault import Vault
+from gestalt.metrics import Metrics
+from gestalt.retry import CircuitOpenError, RetryPolicy
+from gestalt.vault import AsyncVault, Vault, _find
+import threading
+from threading import Thread
+from unittest.mock import patch
+from requests.exceptions import Timeout
+import asyncio
 import datetime
+import socket
+import time
+import pytest
 
 
 def test_get(mount_setup):
@@ -36,3 +46,556 @@ def test_get_cache_hit(mock_db_role_request):
     assert result_one == expected and result_two == expected
     assert vault._secret_expiry_times[key] == expected_expiry_time
     assert vault._secret_values[key] == expected
+
+
+def test_get_concurrent():
+    response = {
+        "lease_id": "",
+        "data": {
+            "last_vault_rotation": "2023-05-31T14:24:41.724285249Z",
+            "ttl": 0,
+            "password": "foo",
+        },
+    }
+    results = []
+    with patch("gestalt.vault.hvac.Client.read", return_value=response):
+        vault = Vault()
+        vault._is_connected = True
+
+        def reader():
+            for _ in range(25):
+                results.append(
+                    vault.get(key="password", path="path", filter=".password"))
+
+        threads = [Thread(target=reader) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    assert results == ["foo"] * 200
+    assert vault.expires_at("password") == datetime.datetime(
+        2023, 5, 31, 14, 24, 41)
+
+
+def test_prefetch():
+    response = {
+        "lease_id": "",
+        "data": {
+            "username": "foo",
+            "password": "bar",
+        },
+    }
+    with patch("gestalt.vault.hvac.Client.read",
+               return_value=response) as mock_read:
+        vault = Vault()
+        vault._is_connected = True
+        vault.prefetch([("ref#.username", "path", ".username"),
+                        ("ref#.password", "path", ".password")])
+        assert mock_read.call_count == 1
+        assert vault._secret_values == {
+            "ref#.username": "foo",
+            "ref#.password": "bar"
+        }
+        # cached secrets are not read again
+        vault.prefetch([("ref#.username", "path", ".username")])
+        assert mock_read.call_count == 1
+
+
+def test_get_path_cache():
+    response = {
+        "lease_id": "",
+        "data": {
+            "db": {
+                "username": "foo",
+                "password": "bar"
+            }
+        },
+    }
+    with patch("gestalt.vault.hvac.Client.read",
+               return_value=response) as mock_read:
+        vault = Vault()
+        vault._is_connected = True
+        assert vault.get(key="username", path="path",
+                         filter=".db.username") == "foo"
+        assert vault.get(key="password", path="path",
+                         filter=".db.password") == "bar"
+        # same key as a previous lookup, but a different filter
+        assert vault.get(key="username", path="path",
+                         filter=".db.password") == "bar"
+        assert mock_read.call_count == 1
+
+
+def test_get_path_cache_lease_expiry():
+    response = {
+        "lease_id": "",
+        "lease_duration": 3600,
+        "data": {
+            "password": "foo"
+        },
+    }
+    with patch("gestalt.vault.hvac.Client.read",
+               return_value=response) as mock_read:
+        vault = Vault()
+        vault._is_connected = True
+        before = datetime.datetime.now()
+        vault.get(key="password", path="path", filter=".password")
+        expiry = vault.expires_at("password")
+        assert before + datetime.timedelta(seconds=3600) <= expiry
+        assert expiry <= datetime.datetime.now() + datetime.timedelta(
+            seconds=3600)
+
+        # a TTL secret rotated before its lease ends expires at the rotation
+        response["data"].update(last_vault_rotation="2023-05-31T14:24:41.0Z",
+                                ttl=60)
+        vault._responses.clear()
+        vault.get(key="rotated", path="path", filter=".password")
+        assert vault.expires_at("rotated") == datetime.datetime(
+            2023, 5, 31, 14, 25, 41)
+        assert mock_read.call_count == 2
+
+
+@pytest.mark.parametrize("filter_", [
+    ".db.password", ".db", ".db.missing", ".db.password.length", ".hosts",
+    ".hosts[1]", "..password", ".db-main.user_name"
+])
+def test_find_matches_jsonpath(filter_):
+    from jsonpath_ng import parse
+    data = {
+        "db": {
+            "password": "foo"
+        },
+        "db-main": {
+            "user_name": "bar"
+        },
+        "hosts": ["a", "b"],
+    }
+    expected = [m.value for m in parse(f"${filter_}").find(data)]
+    assert _find(data, filter_) == expected
+
+
+def test_find_simple_filter_skips_jsonpath():
+    with patch("gestalt.vault.parse") as mock_parse:
+        assert _find({"db": {"password": "foo"}}, ".db.password") == ["foo"]
+        mock_parse.assert_not_called()
+
+
+def test_refresh_renews_lease():
+    response = {
+        "lease_id": "lease-1",
+        "lease_duration": 10,
+        "data": {
+            "password": "foo"
+        },
+    }
+    with patch("gestalt.vault.hvac.Client.read",
+               return_value=response) as mock_read:
+        vault = Vault()
+        vault._is_connected = True
+        vault.get(key="password", path="path", filter=".password")
+        vault._refresh()
+        assert "lease-1" in vault._leases
+        # not due yet
+        with patch.object(vault.vault_client.sys, "renew_lease") as renew:
+            vault._refresh()
+            renew.assert_not_called()
+
+        vault._leases["lease-1"] = datetime.datetime.now()
+        with patch.object(vault.vault_client.sys,
+                          "renew_lease",
+                          return_value={"lease_duration": 3600}) as renew:
+            vault._refresh()
+            renew.assert_called_once_with(lease_id="lease-1")
+        assert vault.expires_at("password") > datetime.datetime.now(
+        ) + datetime.timedelta(seconds=3000)
+        assert vault.get(key="password", path="path",
+                         filter=".password") == "foo"
+        assert mock_read.call_count == 1
+
+
+def test_refresh_rereads_when_renewal_fails():
+    response = {
+        "lease_id": "lease-1",
+        "lease_duration": 10,
+        "data": {
+            "password": "foo"
+        },
+    }
+    with patch("gestalt.vault.hvac.Client.read",
+               return_value=response) as mock_read:
+        vault = Vault()
+        vault._is_connected = True
+        vault.get(key="password", path="path", filter=".password")
+        vault._refresh()
+        vault._leases["lease-1"] = datetime.datetime.now()
+        response["data"]["password"] = "bar"
+        with patch.object(vault.vault_client.sys,
+                          "renew_lease",
+                          side_effect=RuntimeError("max TTL")):
+            vault._refresh()
+        assert mock_read.call_count == 2
+        assert vault._secret_values["password"] == "bar"
+        assert vault.get(key="password", path="path",
+                         filter=".password") == "bar"
+        assert mock_read.call_count == 2
+
+
+def test_refresh_rereads_ttl_secret():
+    rotation = datetime.datetime.now().strftime("%Y-%m-%dT%H:%M:%S.0Z")
+    response = {
+        "lease_id": "",
+        "data": {
+            "last_vault_rotation": rotation,
+            "ttl": 3600,
+            "password": "foo",
+        },
+    }
+    with patch("gestalt.vault.hvac.Client.read",
+               return_value=response) as mock_read:
+        vault = Vault(refresh_fraction=0.5)
+        vault._is_connected = True
+        vault.get(key="password", path="path", filter=".password")
+        vault._refresh()
+        assert mock_read.call_count == 1
+
+        data, expiry, _ = vault._responses["path"]
+        vault._responses["path"] = (data, expiry, datetime.datetime.now())
+        response["data"]["password"] = "bar"
+        vault._refresh()
+        assert mock_read.call_count == 2
+        assert vault.get(key="password", path="path",
+                         filter=".password") == "bar"
+        assert mock_read.call_count == 2
+
+
+def test_refresher_start_stop():
+    vault = Vault()
+    vault.start()
+    with pytest.raises(RuntimeError):
+        vault.start()
+    worker = vault._worker
+    assert worker.is_alive()
+    vault.stop()
+    assert not worker.is_alive()
+
+
+def test_refresher_survives_errors():
+    vault = Vault()
+    with patch.object(vault,
+                      "_next_refresh_delay",
+                      side_effect=RuntimeError("boom")) as delay:
+        vault.start()
+        while delay.call_count == 0:
+            time.sleep(0.01)
+        worker = vault._worker
+        assert worker.is_alive()
+        vault.stop()
+    assert not worker.is_alive()
+
+
+def test_refresh_fraction_bounds():
+    with pytest.raises(ValueError):
+        Vault(refresh_fraction=0)
+    with pytest.raises(ValueError):
+        Vault(refresh_fraction=1.5)
+
+
+def test_async_get_coalesces():
+    response = {
+        "lease_id": "",
+        "data": {
+            "username": "foo",
+            "password": "bar",
+        },
+    }
+
+    def slow_read(path):
+        time.sleep(0.05)
+        return response
+
+    async def read_all(vault):
+        return await asyncio.gather(*[
+            vault.get(key=f"ref#.{field}", path="path", filter=f".{field}")
+            for field in ["username", "password"] * 5
+        ])
+
+    with patch("gestalt.vault.hvac.Client.read",
+               side_effect=slow_read) as mock_read:
+        vault = AsyncVault()
+        vault.vault._is_connected = True
+        results = asyncio.run(read_all(vault))
+        assert results == ["foo", "bar"] * 5
+        assert mock_read.call_count == 1
+        assert vault._in_flight == {}
+        # served from the cache of the wrapped provider
+        assert vault.vault.get(key="ref#.username",
+                               path="path",
+                               filter=".username") == "foo"
+        assert mock_read.call_count == 1
+
+
+def test_get_singleflight():
+    response = {
+        "lease_id": "",
+        "data": {
+            "password": "foo"
+        },
+    }
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking_read(path):
+        started.set()
+        release.wait()
+        return response
+
+    with patch("gestalt.vault.hvac.Client.read",
+               side_effect=blocking_read) as mock_read:
+        vault = Vault()
+        vault._is_connected = True
+        results = []
+
+        def reader():
+            results.append(
+                vault.get(key="password", path="path", filter=".password"))
+
+        threads = [Thread(target=reader) for _ in range(8)]
+        threads[0].start()
+        started.wait()
+        for t in threads[1:]:
+            t.start()
+        # every other reader is waiting on the read in flight
+        while vault.fetch_info()["coalesced"] < 7:
+            time.sleep(0.01)
+        release.set()
+        for t in threads:
+            t.join()
+    assert results == ["foo"] * 8
+    assert mock_read.call_count == 1
+    assert vault.fetch_info() == {"reads": 1, "coalesced": 7}
+
+
+def _expire(vault, key, path, seconds_ago):
+    expiry = datetime.datetime.now() - datetime.timedelta(seconds=seconds_ago)
+    data, _, refresh_at = vault._responses[path]
+    vault._responses[path] = (data, expiry, refresh_at)
+    value, _, filter_, path = vault._secrets[key]
+    vault._secrets[key] = (value, expiry, filter_, path)
+
+
+def test_get_stale_while_revalidate():
+    response = {
+        "lease_id": "",
+        "lease_duration": 3600,
+        "data": {
+            "password": "foo"
+        },
+    }
+    with patch("gestalt.vault.hvac.Client.read",
+               return_value=response) as mock_read:
+        vault = Vault(stale_while_revalidate=30)
+        vault._is_connected = True
+        vault.get(key="password", path="path", filter=".password")
+        _expire(vault, "password", "path", 5)
+        response["data"] = {"password": "bar"}
+        # the stale secret is returned while it is read again in the background
+        assert vault.get(key="password", path="path",
+                         filter=".password") == "foo"
+        deadline = time.monotonic() + 5
+        while (mock_read.call_count < 2
+               or vault._revalidating) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert mock_read.call_count == 2
+        assert vault.get(key="password", path="path",
+                         filter=".password") == "bar"
+
+        # past the window, the lookup waits for the read
+        _expire(vault, "password", "path", 60)
+        response["data"] = {"password": "baz"}
+        assert vault.get(key="password", path="path",
+                         filter=".password") == "baz"
+        assert mock_read.call_count == 3
+
+
+def test_get_max_staleness():
+    response = {
+        "lease_id": "",
+        "lease_duration": 3600,
+        "data": {
+            "password": "foo"
+        },
+    }
+    with patch("gestalt.vault.hvac.Client.read",
+               return_value=response) as mock_read:
+        vault = Vault(max_staleness=60, retry_policy=RetryPolicy(tries=1))
+        vault._is_connected = True
+        vault.get(key="password", path="path", filter=".password")
+        mock_read.side_effect = Timeout("vault is down")
+
+        _expire(vault, "password", "path", 5)
+        assert vault.get(key="password", path="path",
+                         filter=".password") == "foo"
+        _expire(vault, "password", "path", 120)
+        with pytest.raises(RuntimeError):
+            vault.get(key="password", path="path", filter=".password")
+
+
+def test_max_staleness_bounds():
+    with pytest.raises(ValueError):
+        Vault(stale_while_revalidate=30, max_staleness=10)
+
+
+def test_vault_client_pooling():
+    vault = Vault(url="https://vault.example.com",
+                  timeout=(1, 5),
+                  pool_connections=2,
+                  pool_maxsize=32)
+    clients = []
+    threads = [
+        Thread(target=lambda: clients.append(vault.vault_client))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert all(client is clients[0] for client in clients)
+
+    adapter = clients[0].adapter
+    assert adapter._kwargs["timeout"] == (1, 5)
+    http_adapter = adapter.session.get_adapter("https://vault.example.com")
+    assert http_adapter._pool_connections == 2
+    assert http_adapter._pool_maxsize == 32
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE,
+            1) in http_adapter.poolmanager.connection_pool_kw["socket_options"]
+
+
+def test_vault_client_without_keep_alive():
+    vault = Vault(url="https://vault.example.com", keep_alive=False)
+    http_adapter = vault.vault_client.adapter.session.get_adapter(
+        "https://vault.example.com")
+    assert "socket_options" not in http_adapter.poolmanager.connection_pool_kw
+
+
+def test_retry_policy_backoff():
+    policy = RetryPolicy(tries=4, base_delay=1, max_delay=3, jitter=0)
+    assert [policy.delay(n) for n in range(4)] == [1, 2, 3, 3]
+    policy = RetryPolicy(base_delay=1, jitter=0.5)
+    assert all(0.5 <= policy.delay(0) <= 1 for _ in range(100))
+
+
+def test_retry_policy_retries_then_raises():
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise Timeout("timed out")
+        return "ok"
+
+    policy = RetryPolicy(tries=3, base_delay=0, exceptions=(Timeout, ))
+    assert policy.call(flaky) == "ok"
+    assert policy.stats() == {
+        "calls": 1,
+        "retries": 2,
+        "failures": 0,
+        "rejected": 0
+    }
+    calls.clear()
+    with pytest.raises(Timeout):
+        RetryPolicy(tries=2, base_delay=0, exceptions=(Timeout, )).call(flaky)
+    assert len(calls) == 2
+
+
+def test_retry_policy_does_not_retry_other_errors():
+    policy = RetryPolicy(base_delay=0, exceptions=(Timeout, ))
+    with patch("gestalt.retry.time.sleep") as sleep:
+        with pytest.raises(ValueError):
+            policy.call(lambda: int("x"))
+        sleep.assert_not_called()
+    assert policy.stats()["failures"] == 0
+
+
+def test_retry_policy_deadline():
+    policy = RetryPolicy(tries=10,
+                         base_delay=10,
+                         jitter=0,
+                         deadline=5,
+                         exceptions=(Timeout, ))
+
+    def fail():
+        raise Timeout("timed out")
+
+    with patch("gestalt.retry.time.sleep") as sleep:
+        with pytest.raises(Timeout):
+            policy.call(fail)
+        # the first retry would already start after the deadline
+        sleep.assert_not_called()
+
+
+def test_retry_policy_circuit_breaker():
+    policy = RetryPolicy(tries=1,
+                         failure_threshold=2,
+                         reset_timeout=60,
+                         exceptions=(Timeout, ))
+
+    def fail():
+        raise Timeout("timed out")
+
+    for _ in range(2):
+        with pytest.raises(Timeout):
+            policy.call(fail)
+    assert policy.is_open
+    with pytest.raises(CircuitOpenError):
+        policy.call(lambda: "ok")
+    assert policy.stats()["rejected"] == 1
+
+    # once the reset timeout passed, a successful trial call closes the circuit
+    policy._opened_at -= 60
+    assert policy.call(lambda: "ok") == "ok"
+    assert not policy.is_open
+
+
+def test_get_circuit_open():
+    with patch("gestalt.vault.hvac.Client.read",
+               side_effect=Timeout("timed out")) as mock_read:
+        vault = Vault(retry_policy=RetryPolicy(
+            tries=1, failure_threshold=1, reset_timeout=60))
+        vault._is_connected = True
+        with pytest.raises(RuntimeError):
+            vault.get(key="password", path="path", filter=".password")
+        with pytest.raises(CircuitOpenError):
+            vault.get(key="password", path="path", filter=".password")
+        assert mock_read.call_count == 1
+
+
+def test_vault_metrics():
+    responses = [
+        Timeout("timed out"), {
+            "lease_id": "",
+            "data": {
+                "password": "foo"
+            }
+        }
+    ]
+    with patch("gestalt.vault.hvac.Client.read",
+               side_effect=responses), patch("gestalt.retry.time.sleep"):
+        metrics = Metrics()
+        vault = Vault(
+            retry_policy=RetryPolicy(tries=2, exceptions=(Timeout, )))
+        vault._is_connected = True
+        vault.enable_metrics(metrics)
+        for _ in range(3):
+            assert vault.get(key="password", path="path",
+                             filter=".password") == "foo"
+
+    provider = metrics.to_dict()["providers"]["vault"]
+    assert provider["fetches"]["count"] == 1
+    assert provider["errors"] == 0
+    assert provider["retries"] == 1
+    assert metrics.to_dict()["caches"]["vault"] == {
+        "hits": 2,
+        "misses": 1,
+        "hit_ratio": 2 / 3
+    }
+    assert 'gestalt_provider_retries_total{provider="vault"} 1' in (
+        metrics.to_prometheus().splitlines())
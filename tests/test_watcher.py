@@ -0,0 +1,89 @@
+# type: ignore
+
+from queue import Queue
+import json
+import sys
+
+import pytest
+
+import gestalt
+from gestalt.watcher import Watcher
+
+
+def _write(path, data):
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data))
+    tmp.replace(path)
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_watcher_debounces_changes(tmp_path, use_inotify):
+    calls = Queue()
+    config = tmp_path / "config.json"
+    _write(config, {"a": 1})
+    watcher = Watcher([str(tmp_path)],
+                      lambda: calls.put(True),
+                      debounce=0.2,
+                      poll_interval=0.05,
+                      use_inotify=use_inotify)
+    watcher.start()
+    try:
+        if use_inotify and sys.platform.startswith("linux"):
+            assert watcher.uses_inotify
+        for i in range(5):
+            _write(config, {"a": i, "pad": "x" * i})
+        assert calls.get(timeout=5)
+        assert calls.empty()
+    finally:
+        watcher.stop()
+
+
+def test_watcher_start_twice(tmp_path):
+    watcher = Watcher([str(tmp_path)], lambda: None)
+    watcher.start()
+    try:
+        with pytest.raises(RuntimeError):
+            watcher.start()
+    finally:
+        watcher.stop()
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_gestalt_watch(tmp_path, use_inotify):
+    changes = Queue()
+    config = tmp_path / "config.json"
+    _write(config, {"db": {"host": "old", "port": 5432}})
+    g = gestalt.Gestalt()
+    g.add_config_file(str(config))
+    g.build_config()
+    g.on_change(changes.put)
+    g.watch(debounce=0.05, poll_interval=0.05, use_inotify=use_inotify)
+    try:
+        with pytest.raises(RuntimeError):
+            g.watch()
+        _write(config, {"db": {"host": "new", "port": 5432}, "replicas": 3})
+        assert changes.get(timeout=5) == {"db.host", "replicas"}
+        assert g.get_string("db.host") == "new"
+        assert g.get_int("replicas") == 3
+    finally:
+        g.stop_watching()
+
+
+def test_gestalt_watch_keeps_config_on_error(tmp_path):
+    changes = Queue()
+    config = tmp_path / "config.json"
+    _write(config, {"a": 1})
+    g = gestalt.Gestalt()
+    g.add_config_file(str(config))
+    g.build_config()
+    g.on_change(changes.put)
+    g.watch(debounce=0.05, poll_interval=0.05)
+    try:
+        config.write_text("{not json")
+        with pytest.raises(Exception):
+            changes.get(timeout=0.5)
+        assert g.get_int("a") == 1
+        _write(config, {"a": 2})
+        assert changes.get(timeout=5) == {"a"}
+    finally:
+        g.stop_watching()